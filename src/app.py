@@ -1,74 +1,111 @@
-from nicegui import ui
+from nicegui import ui, run, app as nicegui_app
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import mysql.connector
 import cv2
-import base64
 import asyncio
 import numpy as np
 from datetime import datetime
-from ultralytics import YOLO
 import threading
 import time
+from src.core.frame_grabber import acquire_grabber, release_grabber
+from src.core.model_registry import DEFAULT_MODEL_PATH
+from src.core.inference_service import get_inference_service
+from src.core.ocr_pool import get_ocr_pool
+from src.core.db_pool import get_db_pool
+from src.core.member_cache import get_member_index
+from src.core.session_index import get_session_index
+from src.core.schema import migrate
+from src.core.evidence_store import get_evidence_writer, stop_evidence_writer
+from src.core.retention import budgets_for_lanes, get_retention_manager
+from src.core.event_log import get_event_log, stop_event_log
+from src.core.db_writer import stop_db_writer
+from src.core.preview_stream import FrameBroadcaster, MJPEG_MEDIA_TYPE
+from src.core.camera_worker import CameraProcess
+from src.core.lane_registry import LaneRegistry, ROLE_SETTINGS, parse_camera_source
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
 
 class DualCameraANPRApp:
-    def __init__(self):
-        # Camera sources
-        self.entry_camera_source = 0
-        self.exit_camera_source = 1
+    def __init__(self, lanes_file=None):
+        # Lanes (source, role, ROI, tuning) from config/lanes.json, entry + exit by default
+        self.lanes = LaneRegistry.from_file(lanes_file)
         
-        # Camera feed states
-        self.entry_camera_active = False
-        self.exit_camera_active = False
-        self.entry_cap = None
-        self.exit_cap = None
+        # Encoded preview frames, served to every browser from /video/<lane>
+        self.preview_streams = {lane.name: FrameBroadcaster(lane.name) for lane in self.lanes}
+        # Lanes whose preview frame is being produced on a worker thread
+        self.preview_busy = set()
         
-        # Detection states
-        self.entry_detection_running = False
-        self.exit_detection_running = False
-        self.entry_detection_thread = None
-        self.exit_detection_thread = None
+        # "thread" runs lane pipelines inside this process, "process" gives each lane its own
+        self.detection_mode = self.lanes.resources['detection_mode']
         
-        # Detection instances
-        self.entry_anpr = None
-        self.exit_anpr = None
-        
-        # Initialize YOLO model for preview
+        # Shared inference service for preview, loaded on first use
+        self.detector = None
+        self.detector_checked = False
+
+    def get_preview_detector(self):
+        """Shared inference service for preview, batched with the detection cameras.
+
+        Loaded lazily because OCR worker processes re-import this module and
+        must not load YOLO themselves.
+        """
+        if self.detector_checked:
+            return self.detector
+        self.detector_checked = True
         try:
-            model_path = os.path.join(os.getcwd(), "yolov10", "runs", "detect", "train10", "weights", "best.pt")
-            if os.path.exists(model_path):
-                self.model = YOLO(model_path)
+            if os.path.exists(DEFAULT_MODEL_PATH):
+                self.detector = get_inference_service(DEFAULT_MODEL_PATH, **self.lanes.inference_options())
                 print("✅ YOLO model loaded for preview")
             else:
-                self.model = None
                 print("⚠️ YOLO model not found, preview without detection")
         except Exception as e:
-            self.model = None
             print(f"⚠️ Could not load YOLO model: {e}")
+        return self.detector
+
+    def warm_caches(self):
+        """Migrate the schema and load in-memory DB indexes once the server is up"""
+        def load_indexes():
+            try:
+                # Create missing tables/indexes and next months' access_log partitions
+                migrate()
+            except Exception as e:
+                print(f"⚠️ Schema migration failed: {e}")
+            get_member_index()
+            try:
+                get_session_index()
+            except Exception as e:
+                print(f"⚠️ Could not load active session index: {e}")
+
+        # Image/log retention with a budget per lane, fed new files instead of rescanning disk
+        retention = get_retention_manager(budgets_for_lanes(lane.config for lane in self.lanes))
+        get_evidence_writer().add_listener(retention.track)
+        get_event_log().add_listener(retention.track)
+        threading.Thread(target=load_indexes, daemon=True, name="CacheWarmup").start()
 
     def setup_database_connection(self):
         try:
-            conn = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                database="gate_access"
-            )
-            return conn
+            # Checked out from the shared pool, hand back with release_database_connection
+            return get_db_pool().acquire()
         except Exception as e:
             ui.notify(f"Database connection failed: {e}", type='negative')
             return None
 
+    def release_database_connection(self, conn):
+        get_db_pool().release(conn)
+
     def get_recent_logs(self):
         conn = self.setup_database_connection()
         if not conn:
             return []
         
-        cursor = conn.cursor()
-        cursor.execute("SELECT plate_number, status, timestamp FROM access_log ORDER BY timestamp DESC LIMIT 20")
-        logs = cursor.fetchall()
-        conn.close()
-        return logs
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT plate_number, status, timestamp FROM access_log ORDER BY timestamp DESC LIMIT 20")
+            logs = cursor.fetchall()
+            cursor.close()
+            return logs
+        finally:
+            self.release_database_connection(conn)
 
     def add_member(self, plate_number, name="Unknown"):
         conn = self.setup_database_connection()
@@ -79,212 +116,431 @@ class DualCameraANPRApp:
         try:
             cursor.execute("INSERT INTO member_list (plate_number, owner_name) VALUES (%s, %s)", (plate_number, name))
             conn.commit()
+            # Write-through so the next detection sees the new member without a DB lookup
+            get_member_index().add(plate_number)
             return True
         except Exception as e:
             print(f"Error adding member: {e}")
             return False
         finally:
             cursor.close()
-            conn.close()
+            self.release_database_connection(conn)
 
     # ===== CAMERA CAPTURE METHODS =====
-    def capture_frame_from_camera(self, camera_type="entry"):
-        """Capture a frame from specified camera with detection overlay"""
-        
-        # Select the appropriate camera
-        if camera_type == "entry":
-            cap = self.entry_cap
-            camera_source = self.entry_camera_source
-        else:  # exit
-            cap = self.exit_cap
-            camera_source = self.exit_camera_source
-        
-        # Initialize camera if not opened
-        if cap is None:
-            try:
-                # Handle IP cameras with multiple URL formats
-                if isinstance(camera_source, str) and camera_source.startswith('http'):
-                    possible_urls = [
-                        camera_source,
-                        f"{camera_source}/video",
-                        f"{camera_source}/videofeed"
-                    ]
-                    
-                    for url in possible_urls:
-                        cap = cv2.VideoCapture(url)
-                        if cap.isOpened():
-                            ret, test_frame = cap.read()
-                            if ret:
-                                break
-                            else:
-                                cap.release()
-                                cap = None
-                        else:
-                            cap = None
-                else:
-                    cap = cv2.VideoCapture(camera_source)
-                
-                if cap is None or not cap.isOpened():
+    def get_camera_grabber(self, lane_name="entry"):
+        """Get the shared frame grabber for specified lane, opening it if needed"""
+        lane = self.lanes.get(lane_name)
+        if lane.grabber is None:
+            lane.grabber = acquire_grabber(lane.source, lane.config.label)
+        return lane.grabber
+
+    def release_camera_grabber(self, lane_name="entry"):
+        """Release the preview's reference to the shared frame grabber"""
+        lane = self.lanes.get(lane_name)
+        if lane.grabber is not None:
+            release_grabber(lane.grabber.camera_source)
+            lane.grabber = None
+
+    def get_preview_overlay(self, lane_name, frame):
+        """Boxes and labels from the preview detector, as [(box, label)]"""
+        detector = self.get_preview_detector()
+        if detector is None:
+            return []
+        try:
+            # Batched together with the other cameras' frames
+            boxes = detector.detect(frame)
+        except Exception as e:
+            print(f"Detection overlay error for {lane_name}: {e}")
+            return []
+        label = f"{self.lanes.get(lane_name).config.label} - License Plate"
+        return [(box, label) for box in boxes]
+
+    def capture_frame_from_camera(self, lane_name="entry"):
+        """Capture a frame from specified lane with detection overlay, as JPEG bytes"""
+        lane = self.lanes.get(lane_name)
+        with lane.lock:
+            worker = lane.worker
+            if worker is None:
+                if lane.worker_starting:
+                    # The camera is being handed to a worker process
                     return None
-                    
-                # Set camera properties
-                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-                cap.set(cv2.CAP_PROP_FPS, 30)  # Reduced from 60 to prevent conflicts
-                
-                # Store the camera reference
-                if camera_type == "entry":
-                    self.entry_cap = cap
-                else:
-                    self.exit_cap = cap
-                    
-            except Exception as e:
-                print(f"Error opening {camera_type} camera: {e}")
-                return None
+                try:
+                    grabber = self.get_camera_grabber(lane_name)
+                except Exception as e:
+                    print(f"Error opening {lane_name} camera: {e}")
+                    return None
+        if worker is not None:
+            # Annotated by the worker process and read from shared memory, only the encode happens here
+            frame = worker.read_preview()
+            return self.encode_preview_frame(lane_name, frame) if frame is not None else None
+        if grabber is None:
+            return None
         
-        # Capture frame
-        ret, frame = cap.read()
-        if not ret:
+        # Newest frame from the grabber thread, never blocks on the camera
+        frame_id, frame = grabber.read()
+        # Nothing new since the last preview frame, don't annotate and encode it again
+        if frame is None or lane.preview_frame_id == frame_id:
             return None
+        lane.preview_frame_id = frame_id
+        # The grabber frame is shared with detection, draw on a private copy
+        frame = frame.copy()
         
-        # Add detection overlay if model is available
-        if self.model is not None:
-            try:
-                results = self.model.predict(frame, conf=0.25, verbose=False)
-                result = results[0]
-                boxes = result.boxes.xyxy
-                
-                # Draw detection boxes
-                for box in boxes:
-                    x1, y1, x2, y2 = map(int, box)
-                    color = (0, 255, 0) if camera_type == "entry" else (0, 0, 255)
-                    cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-                    label = f"{camera_type.upper()} - License Plate"
-                    cv2.putText(frame, label, (x1, y1 - 10),
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
-            except Exception as e:
-                print(f"Detection overlay error for {camera_type}: {e}")
+        if lane.pipeline is not None:
+            # Headless detection annotates on request with its own tracks, YOLO already saw the frame
+            frame = lane.pipeline.annotate(frame)
+        else:
+            color = lane.config.color
+            for (x1, y1, x2, y2), label in self.get_preview_overlay(lane_name, frame):
+                cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), color, 2)
+                cv2.putText(frame, label, (int(x1), int(y1) - 10),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
         
-        # Convert to base64 for web display
+        return self.encode_preview_frame(lane_name, frame)
+
+    def encode_preview_frame(self, lane_name, frame):
+        """JPEG-encode a preview frame"""
+        # Encoded once here, the MJPEG route sends the same bytes to every viewer
         try:
             _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-            frame_base64 = base64.b64encode(buffer).decode('utf-8')
-            return f"data:image/jpeg;base64,{frame_base64}"
+            return buffer.tobytes()
         except Exception as e:
-            print(f"Frame encoding error for {camera_type}: {e}")
+            print(f"Frame encoding error for {lane_name}: {e}")
             return None
 
+    def publish_preview(self, lane_name="entry"):
+        """Capture, annotate and encode one preview frame for the lane's viewers"""
+        stream = self.preview_streams[lane_name]
+        # Nobody is watching, skip the capture and encode
+        if not stream.viewers:
+            return
+        jpeg = self.capture_frame_from_camera(lane_name)
+        if jpeg:
+            stream.publish(jpeg)
+
+    async def update_preview(self, lane_name="entry"):
+        """Produce the next preview frame on a worker thread, never on the event loop"""
+        # A frame still in progress (slow camera or inference): skip this tick
+        if lane_name in self.preview_busy:
+            return
+        self.preview_busy.add(lane_name)
+        try:
+            await run.io_bound(self.publish_preview, lane_name)
+        finally:
+            self.preview_busy.discard(lane_name)
+
     # ===== CAMERA FEED CONTROL =====
-    def start_camera_feed(self, camera_type="entry"):
-        """Start camera feed for specified camera"""
-        if camera_type == "entry":
-            self.entry_camera_active = True
-        else:
-            self.exit_camera_active = True
-        print(f"✅ {camera_type.upper()} camera feed started")
-
-    def stop_camera_feed(self, camera_type="entry"):
-        """Stop camera feed for specified camera"""
-        if camera_type == "entry":
-            self.entry_camera_active = False
-            if self.entry_cap is not None:
-                self.entry_cap.release()
-                self.entry_cap = None
-        else:
-            self.exit_camera_active = False
-            if self.exit_cap is not None:
-                self.exit_cap.release()
-                self.exit_cap = None
-        print(f"⏹️ {camera_type.upper()} camera feed stopped")
+    def set_camera_source(self, lane_name, source):
+        """Change a lane's camera source, used by the next preview or detection start"""
+        lane = self.lanes.get(lane_name)
+        lane.source = parse_camera_source(source)
+        with lane.lock:
+            self.release_camera_grabber(lane_name)
+        return lane.source
+
+    def start_camera_feed(self, lane_name="entry"):
+        """Start camera feed for specified lane"""
+        self.lanes.get(lane_name).preview_active = True
+        print(f"✅ {lane_name.upper()} camera feed started")
+
+    def stop_camera_feed(self, lane_name="entry"):
+        """Stop camera feed for specified lane"""
+        lane = self.lanes.get(lane_name)
+        lane.preview_active = False
+        self.preview_streams[lane_name].clear()
+        with lane.lock:
+            self.release_camera_grabber(lane_name)
+        print(f"⏹️ {lane_name.upper()} camera feed stopped")
 
     # ===== DETECTION CONTROL =====
-    def start_detection(self, camera_type="entry"):
-        """Start detection for specified camera"""
+    def start_shared_services(self):
+        """Create the detector and OCR pool every lane shares, sized for the configured lanes"""
+        get_inference_service(**self.lanes.inference_options())
+        get_ocr_pool(num_workers=self.lanes.resources['ocr_workers'])
+
+    def start_detection(self, lane_name="entry"):
+        """Start detection for specified lane"""
+        if self.detection_mode == "process":
+            return self.start_detection_process(lane_name)
+        lane = self.lanes.get(lane_name)
+        if lane is None or lane.source is None:
+            return False
         try:
-            if camera_type == "entry":
-                if self.entry_camera_source is None:
-                    return False
-                    
-                # Import here to avoid circular imports
-                from src.core.entry_camera_anpr import EntryCameraANPR
-                self.entry_anpr = EntryCameraANPR(camera_source=self.entry_camera_source)
-                self.entry_detection_running = True
-                
-                def entry_detection_runner():
-                    try:
-                        self.entry_anpr.detect_from_camera()
-                    except Exception as e:
-                        print(f"Entry detection error: {e}")
-                        self.entry_detection_running = False
-                
-                self.entry_detection_thread = threading.Thread(
-                    target=entry_detection_runner,
-                    daemon=True,
-                    name="EntryDetectionThread"
-                )
-                self.entry_detection_thread.start()
-                
-            else:  # exit
-                if self.exit_camera_source is None:
-                    return False
-                    
-                from src.core.exit_camera_anpr import ExitCameraANPR
-                self.exit_anpr = ExitCameraANPR(camera_source=self.exit_camera_source)
-                self.exit_detection_running = True
-                
-                def exit_detection_runner():
-                    try:
-                        self.exit_anpr.detect_from_camera()
-                    except Exception as e:
-                        print(f"Exit detection error: {e}")
-                        self.exit_detection_running = False
-                
-                self.exit_detection_thread = threading.Thread(
-                    target=exit_detection_runner,
-                    daemon=True,
-                    name="ExitDetectionThread"
-                )
-                self.exit_detection_thread.start()
+            # Import here to avoid circular imports
+            from src.core.lane_pipeline import LanePipeline
+            self.start_shared_services()
+            pipeline = LanePipeline(lane.pipeline_config(), headless=True)
+            lane.pipeline = pipeline
+            lane.detection_running = True
+            
+            def detection_runner():
+                try:
+                    pipeline.detect_from_camera()
+                except Exception as e:
+                    print(f"{lane_name.capitalize()} detection error: {e}")
+                    lane.detection_running = False
             
-            print(f"✅ {camera_type.upper()} detection started")
+            lane.thread = threading.Thread(
+                target=detection_runner,
+                daemon=True,
+                name=f"{lane_name.capitalize()}DetectionThread"
+            )
+            lane.thread.start()
+            
+            print(f"✅ {lane_name.upper()} detection started")
             return True
             
         except Exception as e:
-            print(f"❌ Failed to start {camera_type} detection: {e}")
-            if camera_type == "entry":
-                self.entry_detection_running = False
-            else:
-                self.exit_detection_running = False
+            print(f"❌ Failed to start {lane_name} detection: {e}")
+            lane.detection_running = False
+            return False
+
+    def start_detection_process(self, lane_name="entry"):
+        """Start detection for specified lane in its own supervised worker process"""
+        lane = self.lanes.get(lane_name)
+        if lane is None or lane.source is None:
+            return False
+        with lane.lock:
+            old_worker, lane.worker = lane.worker, None
+            # From here on the preview leaves the camera alone until the worker is published
+            lane.worker_starting = True
+            # A local camera opens in one process only; the preview now reads the worker's frames
+            self.release_camera_grabber(lane_name)
+        try:
+            if old_worker is not None:
+                # A worker that gave up still owns its shared-memory ring until stopped
+                old_worker.stop()
+            worker = CameraProcess(lane.pipeline_config(), ocr_workers=self.lanes.resources['worker_ocr_workers'])
+            worker.start()
+        except Exception as e:
+            print(f"❌ Failed to start {lane_name} detection worker: {e}")
+            with lane.lock:
+                lane.worker_starting = False
             return False
+        
+        with lane.lock:
+            lane.worker = worker
+            lane.worker_starting = False
+        lane.detection_running = True
+        print(f"✅ {lane_name.upper()} detection started in worker process")
+        return True
+
+    def get_detection_stats(self, lane_name="entry"):
+        """Runtime statistics of the running detection for specified lane"""
+        lane = self.lanes.get(lane_name)
+        stats = {}
+        if lane.worker is not None:
+            # Reported by the worker process over its control channel
+            stats.update(lane.worker.get_stats())
+        if lane.pipeline is not None:
+            stats.update(lane.pipeline.get_stats())
+        stats['db_pool'] = get_db_pool().get_stats()
+        stats['retention'] = get_retention_manager().get_stats()
+        stats['preview_stream'] = self.preview_streams[lane_name].get_stats()
+        return stats
+
+    def get_detection_status(self, lane_name="entry"):
+        """STOPPED, FAILED, RESTARTING, CONNECTING, RECONNECTING or DETECTING"""
+        lane = self.lanes.get(lane_name)
+        worker, pipeline, thread = lane.worker, lane.pipeline, lane.thread
+        if worker is not None:
+            if not worker.running:
+                # Gave up after max_restarts
+                return 'FAILED'
+            if not worker.is_alive():
+                return 'RESTARTING'
+            # Reported by the worker's pipeline with its other stats
+            camera = worker.get_stats().get('camera', {})
+        elif pipeline is not None:
+            if thread is None or not thread.is_alive():
+                return 'FAILED'
+            camera = pipeline.grabber.get_stats() if pipeline.grabber is not None else {}
+        else:
+            return 'STOPPED'
+        if not camera:
+            # Initial open still being retried
+            return 'CONNECTING'
+        return 'DETECTING' if camera['connected'] else 'RECONNECTING'
+
+    def shutdown(self):
+        """Stop every lane, then flush the queued DB writes, images and event log lines"""
+        for lane in self.lanes:
+            # Also lanes that failed: their worker process is not a daemon
+            if lane.detection_running or lane.worker is not None or lane.pipeline is not None:
+                self.stop_detection(lane.name)
+        # Lanes feed these writers, so they stop last
+        stop_evidence_writer()
+        stop_event_log()
+        stop_db_writer()
+        print("⏹️ Writers flushed, shutdown complete")
 
-    def stop_detection(self, camera_type="entry"):
-        """Stop detection for specified camera"""
+    def stop_detection(self, lane_name="entry"):
+        """Stop detection for specified lane"""
+        lane = self.lanes.get(lane_name)
         try:
-            if camera_type == "entry":
-                self.entry_detection_running = False
-                if hasattr(self, 'entry_anpr') and self.entry_anpr:
-                    self.entry_anpr.should_stop = True
-                self.entry_anpr = None
-            else:  # exit
-                self.exit_detection_running = False
-                if hasattr(self, 'exit_anpr') and self.exit_anpr:
-                    self.exit_anpr.should_stop = True
-                self.exit_anpr = None
+            pipeline, worker, thread = lane.pipeline, lane.worker, lane.thread
+            if worker is not None:
+                # Lets the worker finish its open tracks before it exits
+                worker.stop()
+            if pipeline is not None:
+                pipeline.should_stop = True
+            if thread is not None:
+                # Open tracks are committed and the stages drained before a restart can begin
+                thread.join(timeout=30.0)
+                if thread.is_alive():
+                    print(f"⚠️ {lane_name.upper()} detection thread did not stop in time")
+            lane.thread = None
+            lane.worker = None
+            lane.pipeline = None
+            lane.detection_running = False
             
-            print(f"⏹️ {camera_type.upper()} detection stopped")
+            print(f"⏹️ {lane_name.upper()} detection stopped")
+            detector = pipeline.detector if pipeline is not None else self.detector
+            if detector is not None:
+                stats = detector.get_stats()
+                print(f"📊 Inference batches: avg fill {stats['avg_batch_fill']:.0%}, "
+                      f"avg queue wait {stats['avg_queue_wait_ms']:.1f}ms")
             return True
             
         except Exception as e:
-            print(f"❌ Error stopping {camera_type} detection: {e}")
+            print(f"❌ Error stopping {lane_name} detection: {e}")
             return False
 
 # Create app instance
 app = DualCameraANPRApp()
+# Only the server process loads the caches, not spawned worker processes
+nicegui_app.on_startup(app.warm_caches)
+# The writer threads are daemons, queued writes are lost unless flushed here
+nicegui_app.on_shutdown(app.shutdown)
+
+
+@nicegui_app.get('/video/{lane_name}')
+async def video_stream(lane_name: str):
+    """MJPEG preview stream, fed by the preview timers below"""
+    stream = app.preview_streams.get(lane_name)
+    if stream is None:
+        raise HTTPException(status_code=404, detail=f"Unknown lane: {lane_name}")
+    return StreamingResponse(stream.stream(), media_type=MJPEG_MEDIA_TYPE)
+
+
+@nicegui_app.get('/stats/{lane_name}')
+async def lane_stats(lane_name: str):
+    """Detection, stage/queue, writer and retention stats of one lane as JSON"""
+    if app.lanes.get(lane_name) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown lane: {lane_name}")
+    stats = await run.io_bound(app.get_detection_stats, lane_name)
+    stats['status'] = app.get_detection_status(lane_name)
+    return stats
+
+
+def build_lane_panel(lane):
+    """Preview, source input and preview/detection controls for one lane"""
+    name = lane.name
+    label = lane.config.label
+    ui_color = ROLE_SETTINGS[lane.config.role]['ui_color']
+    
+    with ui.column().classes('w-full'):
+        ui.label(f'🚪 {label} CAMERA').classes(f'text-h6 text-{ui_color}-600 font-bold')
+        
+        # Plain <img> pointed at the MJPEG route, frames never go through the UI diff
+        image = ui.interactive_image().classes(f'w-full max-w-lg border-2 border-{ui_color}-300')
+        
+        # Camera source
+        with ui.row():
+            source_input = ui.input(
+                label=f'{label.capitalize()} Camera Source',
+                value=str(lane.source),
+                placeholder='0 or http://192.168.1.100:8080/video'
+            ).classes('flex-1')
+            ui.button('Set', on_click=lambda: set_source())
+        
+        # Camera controls
+        with ui.row():
+            preview_start = ui.button('Start Preview', on_click=lambda: start_preview()).classes('bg-blue-500')
+            preview_stop = ui.button('Stop Preview', on_click=lambda: stop_preview()).classes('bg-gray-500')
+        
+        with ui.row():
+            detect_start = ui.button('Start Detection', on_click=lambda: start_detection()).classes('bg-green-500')
+            detect_stop = ui.button('Stop Detection', on_click=lambda: stop_detection()).classes('bg-red-500')
+        
+        with ui.row().classes('items-center'):
+            status = ui.label(f'{label.capitalize()} Status: STOPPED').classes('text-sm font-bold text-gray-600')
+            ui.link('Stats', f'/stats/{name}', new_tab=True).classes('text-sm')
+    
+    def set_source():
+        try:
+            source = app.set_camera_source(name, source_input.value)
+            ui.notify(f'{label.capitalize()} camera source set to: {source}', type='positive')
+        except Exception as e:
+            ui.notify(f'Error setting {name} source: {e}', type='negative')
+    
+    def start_preview():
+        app.start_camera_feed(name)
+        # Query string forces the browser to open a fresh stream
+        image.set_source(f'/video/{name}?t={time.time()}')
+        preview_start.disable()
+        preview_stop.enable()
+        ui.notify(f'{label.capitalize()} camera preview started', type='positive')
+    
+    def stop_preview():
+        app.stop_camera_feed(name)
+        preview_start.enable()
+        preview_stop.disable()
+        image.set_source('')
+        ui.notify(f'{label.capitalize()} camera preview stopped', type='info')
+    
+    def start_detection():
+        if app.start_detection(name):
+            detect_start.disable()
+            detect_stop.enable()
+            status.text = f'{label.capitalize()} Status: DETECTING'
+            status.classes('text-sm font-bold text-green-600')
+            ui.notify(f'{label.capitalize()} detection started!', type='positive')
+        else:
+            ui.notify(f'Failed to start {name} detection', type='negative')
+    
+    async def stop_detection():
+        # Waits for the camera to finish its open tracks, off the event loop
+        if await run.io_bound(app.stop_detection, name):
+            detect_start.enable()
+            detect_stop.disable()
+            status.text = f'{label.capitalize()} Status: STOPPED'
+            status.classes('text-sm font-bold text-red-600')
+            ui.notify(f'{label.capitalize()} detection stopped', type='info')
+    
+    # Auto-update the camera feed, published to the lane's MJPEG stream
+    async def update_feed():
+        if lane.preview_active:
+            await app.update_preview(name)
+    
+    ui.timer(0.05, update_feed)   # 20 FPS per lane
+    
+    # The camera reconnects by itself, the status shows while it is down or if the lane died
+    status_colors = {'DETECTING': 'green', 'STOPPED': 'red', 'FAILED': 'red'}
+    
+    def update_status():
+        lane_status = app.get_detection_status(name)
+        text = f'{label.capitalize()} Status: {lane_status}'
+        if status.text == text:
+            return
+        status.text = text
+        status.classes(replace=f'text-sm font-bold text-{status_colors.get(lane_status, "orange")}-600')
+        if lane_status == 'FAILED':
+            # Nothing is running any more, Start builds the lane again
+            lane.detection_running = False
+            detect_start.enable()
+            ui.notify(f'{label.capitalize()} detection failed', type='negative')
+    
+    ui.timer(1.0, update_status)
+    
+    # Initialize button states
+    preview_stop.disable()
+    detect_stop.disable()
 
 # Main UI Layout
-ui.page_title('Dual Camera ANPR System')
+ui.page_title('ANPR System')
 
 with ui.header():
-    ui.label('Dual Camera ANPR System').classes('text-h4')
+    ui.label('ANPR System').classes('text-h4')
 
 with ui.tabs() as tabs:
     monitor_tab = ui.tab('Monitor')
@@ -293,181 +549,12 @@ with ui.tabs() as tabs:
 
 with ui.tab_panels(tabs, value=monitor_tab):
     with ui.tab_panel(monitor_tab):
-        ui.label('Dual Camera Monitoring').classes('text-h5')
+        ui.label(f'Lane Monitoring ({len(app.lanes)} lanes)').classes('text-h5')
         
-        # Dual Camera Layout
-        with ui.row().classes('w-full gap-4'):
-            # ENTRY CAMERA SECTION
-            with ui.column().classes('w-1/2'):
-                ui.label('🚪 ENTRY CAMERA').classes('text-h6 text-green-600 font-bold')
-                
-                # Entry camera preview
-                entry_image = ui.image().classes('w-full max-w-lg border-2 border-green-300')
-                
-                # Entry camera source
-                with ui.row():
-                    entry_input = ui.input(
-                        label='Entry Camera Source',
-                        value='0',
-                        placeholder='0 or http://192.168.1.100:8080/video'
-                    ).classes('flex-1')
-                    ui.button('Set', on_click=lambda: set_entry_source())
-                
-                # Entry camera controls
-                with ui.row():
-                    entry_preview_start = ui.button('Start Preview', 
-                                                   on_click=lambda: start_entry_preview()).classes('bg-blue-500')
-                    entry_preview_stop = ui.button('Stop Preview', 
-                                                  on_click=lambda: stop_entry_preview()).classes('bg-gray-500')
-                
-                with ui.row():
-                    entry_detect_start = ui.button('Start Detection', 
-                                                  on_click=lambda: start_entry_detection()).classes('bg-green-500')
-                    entry_detect_stop = ui.button('Stop Detection', 
-                                                 on_click=lambda: stop_entry_detection()).classes('bg-red-500')
-                
-                entry_status = ui.label('Entry Status: STOPPED').classes('text-sm font-bold text-gray-600')
-            
-            # EXIT CAMERA SECTION
-            with ui.column().classes('w-1/2'):
-                ui.label('🚪 EXIT CAMERA').classes('text-h6 text-red-600 font-bold')
-                
-                # Exit camera preview
-                exit_image = ui.image().classes('w-full max-w-lg border-2 border-red-300')
-                
-                # Exit camera source
-                with ui.row():
-                    exit_input = ui.input(
-                        label='Exit Camera Source',
-                        value='1',
-                        placeholder='1 or http://192.168.1.101:8080/video'
-                    ).classes('flex-1')
-                    ui.button('Set', on_click=lambda: set_exit_source())
-                
-                # Exit camera controls
-                with ui.row():
-                    exit_preview_start = ui.button('Start Preview', 
-                                                  on_click=lambda: start_exit_preview()).classes('bg-blue-500')
-                    exit_preview_stop = ui.button('Stop Preview', 
-                                                 on_click=lambda: stop_exit_preview()).classes('bg-gray-500')
-                
-                with ui.row():
-                    exit_detect_start = ui.button('Start Detection', 
-                                                 on_click=lambda: start_exit_detection()).classes('bg-green-500')
-                    exit_detect_stop = ui.button('Stop Detection', 
-                                                on_click=lambda: stop_exit_detection()).classes('bg-red-500')
-                
-                exit_status = ui.label('Exit Status: STOPPED').classes('text-sm font-bold text-gray-600')
-
-        # Camera Control Functions
-        def set_entry_source():
-            try:
-                source = entry_input.value
-                app.entry_camera_source = int(source) if source.isdigit() else source
-                if app.entry_cap:
-                    app.entry_cap.release()
-                    app.entry_cap = None
-                ui.notify(f'Entry camera source set to: {app.entry_camera_source}', type='positive')
-            except Exception as e:
-                ui.notify(f'Error setting entry source: {e}', type='negative')
-
-        def set_exit_source():
-            try:
-                source = exit_input.value
-                app.exit_camera_source = int(source) if source.isdigit() else source
-                if app.exit_cap:
-                    app.exit_cap.release()
-                    app.exit_cap = None
-                ui.notify(f'Exit camera source set to: {app.exit_camera_source}', type='positive')
-            except Exception as e:
-                ui.notify(f'Error setting exit source: {e}', type='negative')
-
-        # Entry Camera Functions
-        def start_entry_preview():
-            app.start_camera_feed("entry")
-            entry_preview_start.disable()
-            entry_preview_stop.enable()
-            ui.notify('Entry camera preview started', type='positive')
-
-        def stop_entry_preview():
-            app.stop_camera_feed("entry")
-            entry_preview_start.enable()
-            entry_preview_stop.disable()
-            entry_image.set_source('')
-            ui.notify('Entry camera preview stopped', type='info')
-
-        def start_entry_detection():
-            if app.start_detection("entry"):
-                entry_detect_start.disable()
-                entry_detect_stop.enable()
-                entry_status.text = 'Entry Status: DETECTING'
-                entry_status.classes('text-sm font-bold text-green-600')
-                ui.notify('Entry detection started!', type='positive')
-            else:
-                ui.notify('Failed to start entry detection', type='negative')
-
-        def stop_entry_detection():
-            if app.stop_detection("entry"):
-                entry_detect_start.enable()
-                entry_detect_stop.disable()
-                entry_status.text = 'Entry Status: STOPPED'
-                entry_status.classes('text-sm font-bold text-red-600')
-                ui.notify('Entry detection stopped', type='info')
-
-        # Exit Camera Functions
-        def start_exit_preview():
-            app.start_camera_feed("exit")
-            exit_preview_start.disable()
-            exit_preview_stop.enable()
-            ui.notify('Exit camera preview started', type='positive')
-
-        def stop_exit_preview():
-            app.stop_camera_feed("exit")
-            exit_preview_start.enable()
-            exit_preview_stop.disable()
-            exit_image.set_source('')
-            ui.notify('Exit camera preview stopped', type='info')
-
-        def start_exit_detection():
-            if app.start_detection("exit"):
-                exit_detect_start.disable()
-                exit_detect_stop.enable()
-                exit_status.text = 'Exit Status: DETECTING'
-                exit_status.classes('text-sm font-bold text-green-600')
-                ui.notify('Exit detection started!', type='positive')
-            else:
-                ui.notify('Failed to start exit detection', type='negative')
-
-        def stop_exit_detection():
-            if app.stop_detection("exit"):
-                exit_detect_start.enable()
-                exit_detect_stop.disable()
-                exit_status.text = 'Exit Status: STOPPED'
-                exit_status.classes('text-sm font-bold text-red-600')
-                ui.notify('Exit detection stopped', type='info')
-
-        # Auto-update camera feeds
-        async def update_entry_feed():
-            if app.entry_camera_active:
-                frame_data = app.capture_frame_from_camera("entry")
-                if frame_data:
-                    entry_image.set_source(frame_data)
-
-        async def update_exit_feed():
-            if app.exit_camera_active:
-                frame_data = app.capture_frame_from_camera("exit")
-                if frame_data:
-                    exit_image.set_source(frame_data)
-
-        # Timers for camera updates (reduced frequency to prevent conflicts)
-        ui.timer(0.05, update_entry_feed)   # 20 FPS for entry
-        ui.timer(0.05, update_exit_feed)    # 20 FPS for exit
-
-        # Initialize button states
-        entry_preview_stop.disable()
-        entry_detect_stop.disable()
-        exit_preview_stop.disable()
-        exit_detect_stop.disable()
+        # One panel per configured lane, two per row
+        with ui.grid(columns=2).classes('w-full gap-4'):
+            for lane in app.lanes:
+                build_lane_panel(lane)
 
     # Database tab (simplified for now)
     with ui.tab_panel(database_tab):
@@ -0,0 +1,365 @@
+import collections
+import multiprocessing as mp
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+from multiprocessing import shared_memory
+
+# Largest annotated frame a ring slot holds; bigger frames are scaled down to fit
+RING_SLOT_BYTES = 1920 * 1080 * 3
+# Workers only render preview frames while the UI asked for one this recently
+PREVIEW_REQUEST_TTL = 2.0
+
+
+class SharedFrameRing:
+    """Fixed-size ring of frames in shared memory, one writer and any number of readers.
+
+    Each slot carries (seq, height, width, channels). The writer marks a
+    slot busy (seq -1) while copying, so readers detect a torn read by
+    comparing the slot seq before and after their copy and simply retry.
+    """
+
+    HEADER_FIELDS = 4
+
+    def __init__(self, name=None, slots=4, slot_bytes=RING_SLOT_BYTES):
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        # [latest seq, preview requested at (ms)] + per-slot headers
+        header_bytes = (2 + slots * self.HEADER_FIELDS) * 8
+        size = header_bytes + slots * slot_bytes
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.name = self.shm.name
+        self._control = np.ndarray((2,), dtype=np.int64, buffer=self.shm.buf)
+        self._headers = np.ndarray((slots, self.HEADER_FIELDS), dtype=np.int64,
+                                   buffer=self.shm.buf, offset=16)
+        self._data_offset = header_bytes
+        if self.owner:
+            self._control[:] = 0
+            self._headers[:] = 0
+
+    def _slot_view(self, slot, shape):
+        return np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf,
+                          offset=self._data_offset + slot * self.slot_bytes)
+
+    def write(self, frame):
+        """Publish a frame as the newest one"""
+        if frame.nbytes > self.slot_bytes:
+            scale = (self.slot_bytes / frame.nbytes) ** 0.5
+            frame = cv2.resize(frame, (int(frame.shape[1] * scale), int(frame.shape[0] * scale)))
+        if frame.ndim == 2:
+            frame = frame[:, :, None]
+        seq = int(self._control[0]) + 1
+        slot = seq % self.slots
+        self._headers[slot, 0] = -1
+        self._slot_view(slot, frame.shape)[:] = frame
+        self._headers[slot, 1:] = frame.shape
+        self._headers[slot, 0] = seq
+        self._control[0] = seq
+        return seq
+
+    def read_latest(self, last_seq=0):
+        """Copy of the newest frame as (seq, frame), or (last_seq, None) if nothing newer"""
+        for _ in range(3):
+            seq = int(self._control[0])
+            if seq <= last_seq:
+                return last_seq, None
+            slot = seq % self.slots
+            if self._headers[slot, 0] != seq:
+                continue
+            height, width, channels = (int(v) for v in self._headers[slot, 1:])
+            frame = self._slot_view(slot, (height, width, channels)).copy()
+            if self._headers[slot, 0] == seq:
+                return seq, frame
+        return last_seq, None
+
+    def request_preview(self):
+        """Ask the worker to render annotated frames for a while"""
+        self._control[1] = int(time.time() * 1000)
+
+    def preview_requested(self):
+        return time.time() * 1000 - self._control[1] < PREVIEW_REQUEST_TTL * 1000
+
+    def close(self):
+        self._control = None
+        self._headers = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # A reader still holds a view; the mapping goes away with it
+            pass
+        if self.owner:
+            self.shm.unlink()
+
+
+class _ChannelDBWriter:
+    """Stands in for the DB writer inside a worker: access events go to the parent"""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.sent = 0
+
+    def submit(self, event_type, plate_number, timestamp=None):
+        self.channel.put(('access', (event_type, plate_number, timestamp), {}))
+        self.sent += 1
+        return True
+
+    def get_stats(self):
+        return {'forwarded_events': self.sent}
+
+
+class _ChannelEventLog:
+    """Stands in for the event log inside a worker: records go to the parent's log"""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.sent = 0
+
+    def record(self, *args, **kwargs):
+        self.channel.put(('event', args, kwargs))
+        self.sent += 1
+
+    def get_stats(self):
+        return {'forwarded_events': self.sent}
+
+
+def _camera_worker_main(lane_data, ring_name, commands, channel, options):
+    """Worker process: runs one lane pipeline headless and reports back over channel"""
+    # Imported here so the parent never loads the pipeline modules for a worker
+    from src.core.evidence_store import get_evidence_writer
+    from src.core.ocr_pool import get_ocr_pool
+    from src.core.lane_pipeline import LanePipeline
+    from src.core.lane_registry import LaneConfig
+
+    lane = LaneConfig.from_dict(lane_data)
+    ring = SharedFrameRing(name=ring_name)
+    # Created before the pipeline so its OCR pool gets the smaller per-process size
+    get_ocr_pool(num_workers=options.get('ocr_workers', 1))
+    pipeline_factory = options.get('pipeline_factory', LanePipeline)
+    anpr = pipeline_factory(lane, headless=True)
+    # Persistence stays in the parent, where both lanes share one session index
+    anpr.db_writer = _ChannelDBWriter(channel)
+    anpr.event_log = _ChannelEventLog(channel)
+    get_evidence_writer().add_listener(lambda path, size: channel.put(('file', (path, size), {})))
+
+    parent = mp.parent_process()
+
+    def control_loop():
+        while not anpr.should_stop:
+            try:
+                command = commands.get(timeout=0.5)
+            except queue.Empty:
+                # Not a daemon, so it must not outlive an app that died without stopping it
+                if parent is not None and not parent.is_alive():
+                    anpr.should_stop = True
+                continue
+            if command == 'stop':
+                anpr.should_stop = True
+
+    def preview_loop():
+        last_frame_id = 0
+        next_stats = 0.0
+        while not anpr.should_stop:
+            now = time.time()
+            if now >= next_stats:
+                channel.put(('stats', (anpr.get_stats(),), {}))
+                next_stats = now + options.get('stats_interval', 2.0)
+            # The pipeline's grabber, set once the camera opened (it may still be retrying)
+            grabber = anpr.grabber
+            if grabber is None or not ring.preview_requested():
+                time.sleep(0.1)
+                continue
+            frame_id, frame = grabber.wait_for_frame(last_frame_id, timeout=0.5)
+            if frame_id != last_frame_id and frame is not None:
+                last_frame_id = frame_id
+                ring.write(anpr.annotate(frame.copy()))
+            time.sleep(options.get('preview_interval', 0.05))
+
+    threading.Thread(target=control_loop, daemon=True, name="WorkerControl").start()
+    preview_thread = threading.Thread(target=preview_loop, daemon=True, name="WorkerPreview")
+    preview_thread.start()
+    channel.put(('started', (), {}))
+    reason = "stopped"
+    try:
+        anpr.detect_from_camera()
+    except Exception as e:
+        reason = f"error: {e}"
+    finally:
+        anpr.should_stop = True
+        # Images still queued are written before the process goes
+        get_evidence_writer().stop()
+        get_ocr_pool().stop()
+        channel.put(('stats', (anpr.get_stats(),), {}))
+        channel.put(('stopped', (reason,), {}))
+        preview_thread.join(timeout=2.0)
+        ring.close()
+
+
+class CameraProcess:
+    """One camera pipeline in its own OS process, supervised from the app.
+
+    Frames come back through a SharedFrameRing and everything else over a
+    control channel: access events and event-log records are persisted
+    here by the app's DB writer and event log, evidence files are handed
+    to retention, and the worker's stats are kept for the UI. A worker
+    that dies unexpectedly is restarted up to max_restarts times.
+
+    options are passed to the worker: ocr_workers, stats_interval,
+    preview_interval and pipeline_factory (LanePipeline by default).
+    """
+
+    def __init__(self, lane, max_restarts=3, **options):
+        self.lane = lane
+        self.camera_type = lane.name
+        self.max_restarts = max_restarts
+        self.options = options
+        self.restarts = 0
+        self.starts = 0
+        self.stats = {}
+        self.recent_plates = collections.deque(maxlen=50)
+        self.running = False
+        self._context = mp.get_context("spawn")
+        self._process = None
+        self._commands = None
+        self._channel = None
+        self._ring = None
+        self._listener = None
+        self._last_preview_seq = 0
+
+    def start(self):
+        """Start the worker process and the channel listener"""
+        if self.running:
+            return
+        self._ring = SharedFrameRing()
+        self._commands = self._context.Queue()
+        self._channel = self._context.Queue()
+        self.running = True
+        self._spawn()
+        self._listener = threading.Thread(target=self._listen, daemon=True,
+                                          name=f"{self.camera_type.capitalize()}WorkerListener")
+        self._listener.start()
+
+    def _spawn(self):
+        self._process = self._context.Process(
+            target=_camera_worker_main,
+            args=(self.lane.to_dict(), self._ring.name,
+                  self._commands, self._channel, self.options),
+            # Not a daemon: the worker's OCR pool starts processes of its own, which
+            # daemonic processes may not; stop() and the app's shutdown end it instead
+            daemon=False,
+            name=f"{self.camera_type.capitalize()}CameraWorker"
+        )
+        self._process.start()
+        print(f"✅ [{self.camera_type.upper()}] Camera worker started (pid {self._process.pid})")
+
+    def stop(self, timeout=10.0):
+        """Ask the worker to finish its tracks and exit, terminating it if it hangs.
+
+        Also cleans up after a worker that gave up restarting.
+        """
+        was_running, self.running = self.running, False
+        if self._process is None:
+            return
+        if was_running:
+            self._commands.put('stop')
+            self._process.join(timeout=timeout)
+        if self._process.is_alive():
+            print(f"⚠️ [{self.camera_type.upper()}] Camera worker did not stop, terminating")
+            self._process.terminate()
+            self._process.join(timeout=2.0)
+        if self._listener is not None and self._listener is not threading.current_thread():
+            self._listener.join(timeout=2.0)
+        self._drain()
+        self._close_ring()
+
+    def _close_ring(self):
+        # Detach first so a concurrent read_preview() sees no ring
+        ring, self._ring = self._ring, None
+        if ring is not None:
+            ring.close()
+
+    def is_alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    def read_preview(self):
+        """Newest annotated frame from the worker, or None if nothing new"""
+        ring = self._ring
+        if ring is None:
+            return None
+        try:
+            ring.request_preview()
+            seq, frame = ring.read_latest(self._last_preview_seq)
+        except (TypeError, ValueError):
+            # Ring closed by stop() while reading
+            return None
+        self._last_preview_seq = seq
+        return frame
+
+    def _handle(self, kind, args, kwargs):
+        # Imported lazily, the parent side only needs these once a worker reports
+        if kind == 'access':
+            from src.core.db_writer import get_db_writer
+            get_db_writer().submit(*args, **kwargs)
+        elif kind == 'event':
+            from src.core.event_log import get_event_log
+            get_event_log().record(*args, **kwargs)
+            self.recent_plates.append(args[1] if len(args) > 1 else kwargs.get('plate_number'))
+        elif kind == 'file':
+            from src.core.retention import get_retention_manager
+            get_retention_manager().track(*args)
+        elif kind == 'started':
+            self.starts += 1
+        elif kind == 'stats':
+            self.stats = args[0]
+        elif kind == 'stopped':
+            print(f"⏹️ [{self.camera_type.upper()}] Camera worker {args[0]}")
+
+    def _drain(self):
+        while True:
+            try:
+                kind, args, kwargs = self._channel.get_nowait()
+            except (queue.Empty, OSError, ValueError):
+                return
+            self._handle(kind, args, kwargs)
+
+    def _listen(self):
+        while self.running:
+            try:
+                kind, args, kwargs = self._channel.get(timeout=0.5)
+            except queue.Empty:
+                if self.running and not self._process.is_alive():
+                    self._restart()
+                continue
+            try:
+                self._handle(kind, args, kwargs)
+            except Exception as e:
+                print(f"❌ [{self.camera_type.upper()}] Worker message error: {e}")
+
+    def _restart(self):
+        if self.restarts >= self.max_restarts:
+            print(f"❌ [{self.camera_type.upper()}] Camera worker exited "
+                  f"(code {self._process.exitcode}), giving up after {self.restarts} restarts")
+            self.running = False
+            # Nothing will write to the ring again, free its shared memory now
+            self._close_ring()
+            return
+        self.restarts += 1
+        delay = min(2 ** self.restarts, 30)
+        print(f"⚠️ [{self.camera_type.upper()}] Camera worker exited (code {self._process.exitcode}), "
+              f"restarting in {delay}s")
+        time.sleep(delay)
+        if self.running:
+            self._spawn()
+
+    def get_stats(self):
+        """Last stats reported by the worker, plus supervision counters"""
+        stats = dict(self.stats)
+        stats['worker'] = {
+            'pid': self._process.pid if self._process is not None else None,
+            'alive': self.is_alive(),
+            'restarts': self.restarts,
+            'starts': self.starts,
+        }
+        return stats
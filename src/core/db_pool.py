@@ -0,0 +1,206 @@
+import mysql.connector
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+DB_CONFIG = {
+    'host': "localhost",
+    'user': "root",
+    'database': "gate_access",
+}
+
+
+class PoolExhaustedError(Exception):
+    """No connection became free within the checkout timeout"""
+
+
+class ConnectionPool:
+    """Size-limited MySQL connection pool shared by the app and the cameras.
+
+    Idle connections are pinged before reuse once they have been idle for
+    ping_interval seconds, and a background health check drops dead ones.
+    Checkout wait times are recorded to help size the pool.
+    """
+
+    def __init__(self, pool_size=5, checkout_timeout=5.0, ping_interval=10.0,
+                 health_check_interval=60.0, **db_config):
+        self.pool_size = pool_size
+        self.checkout_timeout = checkout_timeout
+        self.ping_interval = ping_interval
+        self.health_check_interval = health_check_interval
+        self.db_config = db_config or dict(DB_CONFIG)
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._health_thread = None
+        self.running = False
+
+        # Checkout statistics
+        self.checkouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.timeouts = 0
+        self.discarded = 0
+
+    def start(self):
+        """Start the background health check"""
+        if self.running:
+            return
+        self.running = True
+        self._health_thread = threading.Thread(target=self._health_loop, daemon=True, name="DBPoolHealth")
+        self._health_thread.start()
+
+    def _connect(self):
+        return mysql.connector.connect(**self.db_config)
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._created -= 1
+            self.discarded += 1
+
+    def _ping(self, conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def acquire(self):
+        """Check out a connection, waiting up to checkout_timeout for a free one"""
+        started = time.time()
+        conn = None
+        while conn is None:
+            try:
+                conn, idle_since = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._created < self.pool_size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    try:
+                        conn = self._connect()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                    break
+                remaining = self.checkout_timeout - (time.time() - started)
+                if remaining <= 0:
+                    with self._lock:
+                        self.timeouts += 1
+                    raise PoolExhaustedError(f"No database connection free after {self.checkout_timeout}s")
+                try:
+                    conn, idle_since = self._idle.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+
+            # Pre-ping connections that sat idle long enough to have been dropped
+            if time.time() - idle_since > self.ping_interval and not self._ping(conn):
+                self._discard(conn)
+                conn = None
+
+        wait_ms = (time.time() - started) * 1000.0
+        with self._lock:
+            self._in_use += 1
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        return conn
+
+    def release(self, conn, broken=False):
+        """Return a connection to the pool, or drop it if it is broken"""
+        with self._lock:
+            self._in_use -= 1
+        if not broken:
+            try:
+                # Never hand out a connection with someone else's open transaction
+                if conn.in_transaction:
+                    conn.rollback()
+            except Exception:
+                broken = True
+        if broken:
+            self._discard(conn)
+        else:
+            self._idle.put((conn, time.time()))
+
+    @contextmanager
+    def connection(self):
+        """with pool.connection() as conn: ... returns the connection afterwards"""
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except mysql.connector.errors.OperationalError:
+            broken = True
+            raise
+        except mysql.connector.errors.InterfaceError:
+            broken = True
+            raise
+        finally:
+            self.release(conn, broken=broken)
+
+    def health_check(self):
+        """Ping every idle connection and drop the dead ones, returning how many were dropped"""
+        idle = []
+        while True:
+            try:
+                idle.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+        dropped = 0
+        for conn, _ in idle:
+            if self._ping(conn):
+                self._idle.put((conn, time.time()))
+            else:
+                self._discard(conn)
+                dropped += 1
+        if dropped:
+            print(f"⚠️ DB pool health check dropped {dropped} dead connections")
+        return dropped
+
+    def _health_loop(self):
+        while self.running:
+            time.sleep(self.health_check_interval)
+            try:
+                self.health_check()
+            except Exception as e:
+                print(f"DB pool health check error: {e}")
+
+    def get_stats(self):
+        """Pool occupancy and checkout wait times"""
+        with self._lock:
+            checkouts = self.checkouts or 1
+            return {
+                'pool_size': self.pool_size,
+                'open_connections': self._created,
+                'in_use': self._in_use,
+                'idle': self._idle.qsize(),
+                'checkouts': self.checkouts,
+                'avg_checkout_wait_ms': self.total_wait_ms / checkouts,
+                'max_checkout_wait_ms': self.max_wait_ms,
+                'checkout_timeouts': self.timeouts,
+                'discarded_connections': self.discarded,
+            }
+
+
+# Process-wide pool shared by the app, the DB writer and the cameras
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_db_pool(pool_size=5):
+    """Return the shared connection pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(pool_size=pool_size, **DB_CONFIG)
+            _pool.start()
+        return _pool
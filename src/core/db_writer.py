@@ -0,0 +1,330 @@
+import mysql.connector
+import queue
+import threading
+import time
+from datetime import datetime
+from src.core.db_pool import PoolExhaustedError, get_db_pool
+from src.core.member_cache import get_member_index, normalize_plate
+from src.core.session_index import ActiveSession, get_session_index
+
+# MySQL errors worth retrying: lock wait timeout, deadlock
+TRANSIENT_ERRNOS = {1205, 1213}
+
+# Where each event type is recorded in access_log
+CAMERA_LOCATIONS = {
+    'entry': 'main_entrance',
+    'exit': 'main_exit',
+}
+
+
+class AccessEvent:
+    """One plate read waiting to be written to the database"""
+
+    def __init__(self, event_type, plate_number, timestamp=None):
+        self.event_type = event_type
+        self.plate_number = plate_number
+        self.timestamp = timestamp or datetime.now()
+        self.queued_at = time.time()
+
+
+class DBWriter:
+    """Write-behind writer for access_log and vehicle_sessions.
+
+    Cameras only enqueue events. A background thread groups them into one
+    transaction per flush, batching the access_log inserts with
+    executemany, and flushes when the batch is full or the interval passed.
+    Transient errors are retried with backoff; a batch that still fails is
+    written one event per transaction, so only the bad event is lost.
+    """
+
+    def __init__(self, max_queue=1000, batch_size=50, flush_interval=0.5,
+                 max_retries=3, retry_backoff=0.5):
+        self.events = queue.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.running = False
+        self._thread = None
+
+        # Writer statistics
+        self._stats_lock = threading.Lock()
+        self.flush_count = 0
+        self.written_events = 0
+        self.failed_events = 0
+        self.dropped_events = 0
+        self.retries = 0
+        self.split_batches = 0
+        self.total_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.max_event_delay_ms = 0.0
+
+    def start(self):
+        """Start the writer thread"""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="DBWriter")
+        self._thread.start()
+        print(f"✅ DB writer started (batch={self.batch_size}, interval={self.flush_interval}s)")
+
+    def stop(self, timeout=10.0):
+        """Flush what is queued and stop the writer thread"""
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def submit(self, event_type, plate_number, timestamp=None):
+        """Queue an 'entry', 'exit' or 'basic' access event, never blocking the caller"""
+        try:
+            self.events.put_nowait(AccessEvent(event_type, plate_number, timestamp))
+            return True
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped_events += 1
+            print(f"⚠️ DB writer queue full, dropped {event_type} event for {plate_number}")
+            return False
+
+    def _collect_batch(self):
+        batch = []
+        deadline = time.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.events.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while self.running or not self.events.empty():
+            batch = self._collect_batch()
+            if batch:
+                self._flush(batch)
+
+    @staticmethod
+    def _is_transient(error):
+        """Lost connections and lock conflicts, which a later attempt may get past"""
+        if isinstance(error, (mysql.connector.errors.OperationalError,
+                              mysql.connector.errors.InterfaceError,
+                              PoolExhaustedError)):
+            return True
+        return getattr(error, 'errno', None) in TRANSIENT_ERRNOS
+
+    def _write(self, batch):
+        """Write events in one transaction, raising if it was rolled back"""
+        pool = get_db_pool()
+        conn = None
+        broken = False
+        try:
+            conn = pool.acquire()
+            cursor = conn.cursor()
+
+            member_index = get_member_index()
+            if member_index.loaded:
+                # Hash lookup in the in-process index, no round-trip
+                is_member = member_index.is_member
+            else:
+                # Index not loaded yet, one member query for every plate in the batch
+                plates = sorted({event.plate_number for event in batch})
+                placeholders = ", ".join(["%s"] * len(plates))
+                cursor.execute(f"SELECT plate_number FROM member_list WHERE plate_number IN ({placeholders})",
+                               plates)
+                members = {row[0] for row in cursor.fetchall()}
+                is_member = members.__contains__
+
+            log_rows = []
+            basic_rows = []
+            for event in batch:
+                status = 'member' if is_member(event.plate_number) else 'guest'
+                if event.event_type == 'basic':
+                    basic_rows.append((event.plate_number, status, event.timestamp))
+                else:
+                    log_rows.append((event.plate_number, status, event.event_type,
+                                     CAMERA_LOCATIONS[event.event_type], event.timestamp))
+
+            if log_rows:
+                cursor.executemany("""
+                    INSERT INTO access_log (plate_number, status, event_type, camera_location, timestamp)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, log_rows)
+            if basic_rows:
+                cursor.executemany("""
+                    INSERT INTO access_log (plate_number, status, timestamp)
+                    VALUES (%s, %s, %s)
+                """, basic_rows)
+
+            # Sessions depend on each other, so apply them in arrival order. The
+            # in-memory index replaces the per-event active-session SELECT.
+            sessions = get_session_index().begin()
+            for event in batch:
+                status = 'member' if is_member(event.plate_number) else 'guest'
+                if event.event_type == 'entry':
+                    self._apply_entry(cursor, sessions, event, status)
+                elif event.event_type == 'exit':
+                    self._apply_exit(cursor, sessions, event, status)
+
+            conn.commit()
+            # Only a committed transaction may change the index
+            sessions.commit()
+            cursor.close()
+        except Exception:
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except Exception:
+                    broken = True
+            raise
+        finally:
+            if conn is not None:
+                pool.release(conn, broken=broken)
+
+    def _write_with_retry(self, batch):
+        """Write events, retrying transient errors with backoff; the last error or None"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._write(batch)
+                return None
+            except Exception as e:
+                error = e
+                if not self._is_transient(e) or attempt == self.max_retries:
+                    break
+                with self._stats_lock:
+                    self.retries += 1
+                delay = self.retry_backoff * 2 ** attempt
+                print(f"⚠️ Database error (DB writer), retrying in {delay:.1f}s: {e}")
+                time.sleep(delay)
+        return error
+
+    def _flush(self, batch):
+        started = time.time()
+        written = 0
+        failed = 0
+        error = self._write_with_retry(batch)
+        if error is None:
+            written = len(batch)
+        elif len(batch) == 1:
+            print(f"Database error (DB writer): {error}")
+            failed = 1
+        else:
+            # One transaction per event, so a bad event only loses itself
+            print(f"Database error (DB writer), writing {len(batch)} events one by one: {error}")
+            with self._stats_lock:
+                self.split_batches += 1
+            for event in batch:
+                event_error = self._write_with_retry([event])
+                if event_error is None:
+                    written += 1
+                else:
+                    failed += 1
+                    print(f"Database error (DB writer), dropped {event.event_type} event "
+                          f"for {event.plate_number}: {event_error}")
+
+        finished = time.time()
+        flush_ms = (finished - started) * 1000.0
+        with self._stats_lock:
+            self.flush_count += 1
+            self.written_events += written
+            self.failed_events += failed
+            self.total_flush_ms += flush_ms
+            self.max_flush_ms = max(self.max_flush_ms, flush_ms)
+            self.max_event_delay_ms = max(self.max_event_delay_ms,
+                                          (finished - batch[0].queued_at) * 1000.0)
+
+    def _apply_entry(self, cursor, sessions, event, status):
+        plate_number = event.plate_number
+        existing_session = sessions.get(plate_number)
+
+        if existing_session:
+            # Update existing session entry time
+            cursor.execute("""
+                UPDATE vehicle_sessions
+                SET entry_time = %s, updated_at = %s
+                WHERE id = %s
+            """, (event.timestamp, datetime.now(), existing_session.session_id))
+            sessions.put(ActiveSession(existing_session.session_id, plate_number,
+                                       event.timestamp, existing_session.member_status))
+            print(f"🔄 [ENTRY-UPDATE] {plate_number} session updated")
+        else:
+            # Create new session
+            cursor.execute("""
+                INSERT INTO vehicle_sessions (plate_number, entry_time, member_status, status)
+                VALUES (%s, %s, %s, 'active')
+            """, (plate_number, event.timestamp, status))
+            sessions.put(ActiveSession(cursor.lastrowid, plate_number, event.timestamp, status))
+            print(f"🚪 [ENTRY-NEW] {plate_number} new session started")
+        print(f"✅ [ENTRY-{status.upper()}] {plate_number} entered and logged to database.")
+
+    def _apply_exit(self, cursor, sessions, event, status):
+        plate_number = event.plate_number
+        # Tolerates a one-character OCR slip between the entry and exit reads
+        active_session = sessions.find(plate_number)
+
+        if active_session:
+            if normalize_plate(active_session.plate_number) != normalize_plate(plate_number):
+                print(f"🔗 [EXIT-MATCH] {plate_number} matched active session of {active_session.plate_number}")
+            exit_time = event.timestamp
+
+            # Calculate duration in minutes
+            duration_minutes = int((exit_time - active_session.entry_time).total_seconds() / 60)
+
+            # Update session as completed
+            cursor.execute("""
+                UPDATE vehicle_sessions
+                SET exit_time = %s, duration_minutes = %s, status = 'completed', updated_at = %s
+                WHERE id = %s
+            """, (exit_time, duration_minutes, datetime.now(), active_session.session_id))
+            sessions.remove(active_session.plate_number)
+            print(f"🚪 [EXIT-COMPLETE] {plate_number} session completed - Duration: {duration_minutes} minutes")
+        else:
+            # No active session found, create incomplete exit record
+            cursor.execute("""
+                INSERT INTO vehicle_sessions (plate_number, exit_time, member_status, status)
+                VALUES (%s, %s, %s, 'incomplete')
+            """, (plate_number, event.timestamp, status))
+            print(f"⚠️ [EXIT-INCOMPLETE] {plate_number} exit without entry record")
+        print(f"✅ [EXIT-{status.upper()}] {plate_number} exited and logged to database.")
+
+    def get_stats(self):
+        """Queue depth, flush latency and event counts"""
+        with self._stats_lock:
+            flushes = self.flush_count or 1
+            return {
+                'queue_depth': self.events.qsize(),
+                'queue_capacity': self.events.maxsize,
+                'flushes': self.flush_count,
+                'written_events': self.written_events,
+                'failed_events': self.failed_events,
+                'dropped_events': self.dropped_events,
+                'retries': self.retries,
+                'split_batches': self.split_batches,
+                'avg_flush_ms': self.total_flush_ms / flushes,
+                'max_flush_ms': self.max_flush_ms,
+                'max_event_delay_ms': self.max_event_delay_ms,
+            }
+
+
+# Process-wide writer shared by every camera
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_db_writer():
+    """Return the shared DB writer, starting it on first use"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = DBWriter()
+            _writer.start()
+        return _writer
+
+
+def stop_db_writer():
+    """Write what is queued and stop the shared writer, if it was started"""
+    with _writer_lock:
+        writer = _writer
+    if writer is not None:
+        writer.stop()
@@ -0,0 +1,246 @@
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, date, timedelta
+
+base_dir = os.path.abspath(os.path.dirname(__file__))
+project_dir = os.path.dirname(os.path.dirname(base_dir))
+EVENT_LOG_DIR = os.path.join(project_dir, "HasilDeteksi", "events")
+
+# One file per day, rolled over to the next sequence number when it grows too big
+EVENT_FILE_PATTERN = re.compile(r"^events_(\d{4}-\d{2}-\d{2})_(\d{3})\.jsonl$")
+
+
+class EventLog:
+    """Buffered JSONL log of plate detections.
+
+    record() only appends to an in-memory buffer; a flush thread writes
+    the buffer with one write() once it holds max_buffer events or
+    flush_interval seconds have passed. Files are named
+    events_<day>_<seq>.jsonl and roll over on a new day or past
+    max_file_bytes.
+    """
+
+    def __init__(self, log_dir=EVENT_LOG_DIR, max_buffer=100, flush_interval=1.0,
+                 max_file_bytes=50 * 1024 ** 2):
+        self.log_dir = log_dir
+        self.max_buffer = max_buffer
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.running = False
+        self._buffer = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self._file = None
+        self._file_day = None
+        self._file_seq = 0
+        self._file_bytes = 0
+        self._listeners = []
+
+        # Log statistics
+        self.recorded = 0
+        self.flushes = 0
+        self.failed = 0
+
+    def add_listener(self, callback):
+        """Call callback(path, size) for each event file the log closes"""
+        self._listeners.append(callback)
+
+    def start(self):
+        """Start the flush thread"""
+        if self.running:
+            return
+        os.makedirs(self.log_dir, exist_ok=True)
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="EventLog")
+        self._thread.start()
+        print(f"✅ Event log started: {self.log_dir}")
+
+    def stop(self, timeout=5.0):
+        """Flush what is buffered and close the current file"""
+        with self._condition:
+            self.running = False
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def record(self, camera, plate_number, confidence=None, box=None, timings=None,
+               image_path=None, timestamp=None, **extra):
+        """Buffer one detection event"""
+        event = {
+            'timestamp': datetime.fromtimestamp(timestamp or time.time()).isoformat(timespec='milliseconds'),
+            'camera': camera,
+            'plate': plate_number,
+            'confidence': round(float(confidence), 4) if confidence is not None else None,
+            'box': [int(v) for v in box] if box is not None else None,
+            'timings': timings or {},
+            'image_path': image_path,
+        }
+        event.update(extra)
+        with self._condition:
+            self._buffer.append(event)
+            self.recorded += 1
+            if len(self._buffer) >= self.max_buffer:
+                self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self.running and len(self._buffer) < self.max_buffer:
+                    self._condition.wait(timeout=self.flush_interval)
+                events, self._buffer = self._buffer, []
+                running = self.running
+            if events:
+                self._write(events)
+            if not running:
+                break
+        self._close_file()
+
+    def _open_file(self, day):
+        # Continue the newest file of the day after a restart
+        seq = 0
+        for name in os.listdir(self.log_dir):
+            match = EVENT_FILE_PATTERN.match(name)
+            if match and match.group(1) == day:
+                seq = max(seq, int(match.group(2)))
+        self._open_seq(day, max(seq, 1))
+
+    def _open_seq(self, day, seq):
+        path = os.path.join(self.log_dir, f"events_{day}_{seq:03d}.jsonl")
+        self._file = open(path, "a", encoding="utf-8")
+        self._file_day = day
+        self._file_seq = seq
+        self._file_bytes = self._file.tell()
+
+    def _close_file(self):
+        if self._file is None:
+            return
+        path, size = self._file.name, self._file_bytes
+        self._file.close()
+        self._file = None
+        for callback in self._listeners:
+            try:
+                callback(path, size)
+            except Exception as e:
+                print(f"Event log listener error: {e}")
+
+    def _write(self, events):
+        day = date.today().isoformat()
+        try:
+            if self._file is not None and self._file_day != day:
+                self._close_file()
+            if self._file is None:
+                self._open_file(day)
+            elif self._file_bytes >= self.max_file_bytes:
+                seq = self._file_seq + 1
+                self._close_file()
+                self._open_seq(day, seq)
+
+            data = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+            self._file.write(data)
+            self._file.flush()
+            self._file_bytes += len(data.encode("utf-8"))
+            self.flushes += 1
+        except OSError as e:
+            self.failed += len(events)
+            print(f"❌ Could not write {len(events)} events to the event log: {e}")
+
+    def get_stats(self):
+        """Buffered, recorded and failed event counts"""
+        with self._condition:
+            return {
+                'buffered': len(self._buffer),
+                'recorded': self.recorded,
+                'flushes': self.flushes,
+                'failed': self.failed,
+                'current_file': self._file.name if self._file is not None else None,
+            }
+
+
+def _event_files(log_dir, start_day=None, end_day=None):
+    try:
+        names = os.listdir(log_dir)
+    except FileNotFoundError:
+        return []
+    files = []
+    for name in names:
+        match = EVENT_FILE_PATTERN.match(name)
+        if not match:
+            continue
+        day = match.group(1)
+        if (start_day and day < start_day) or (end_day and day > end_day):
+            continue
+        files.append((day, int(match.group(2)), os.path.join(log_dir, name)))
+    return [path for _, _, path in sorted(files)]
+
+
+def iter_events(log_dir=EVENT_LOG_DIR, start=None, end=None, camera=None, plate=None):
+    """Stream logged events in time order, one line at a time.
+
+    start/end are datetimes, start inclusive and end exclusive (pass the
+    next midnight for a whole day); whole files outside the range are
+    skipped by name. camera and plate filter on exact (case-insensitive)
+    match.
+    """
+    start_day = start.date().isoformat() if start else None
+    # An end at midnight needs nothing from that day's files
+    end_day = (end - timedelta(microseconds=1)).date().isoformat() if end else None
+    start_text = start.isoformat(timespec='milliseconds') if start else None
+    end_text = end.isoformat(timespec='milliseconds') if end else None
+    camera = camera.upper() if camera else None
+    plate = plate.replace(" ", "").upper() if plate else None
+
+    for path in _event_files(log_dir, start_day, end_day):
+        with open(path, encoding="utf-8") as event_file:
+            for line in event_file:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash
+                    continue
+                # ISO timestamps compare correctly as strings
+                if start_text and event['timestamp'] < start_text:
+                    continue
+                if end_text and event['timestamp'] >= end_text:
+                    continue
+                if camera and (event.get('camera') or "").upper() != camera:
+                    continue
+                if plate and (event.get('plate') or "").replace(" ", "").upper() != plate:
+                    continue
+                yield event
+
+
+# Process-wide log shared by every camera
+_event_log = None
+_event_log_lock = threading.Lock()
+
+
+def get_event_log():
+    """Return the shared event log, starting it on first use"""
+    global _event_log
+    with _event_log_lock:
+        if _event_log is None:
+            _event_log = EventLog()
+            _event_log.start()
+        return _event_log
+
+
+def stop_event_log():
+    """Flush and close the shared event log, if it was started"""
+    with _event_log_lock:
+        event_log = _event_log
+    if event_log is not None:
+        event_log.stop()
+
+
+if __name__ == "__main__":
+    import sys
+    # python src/core/event_log.py [YYYY-MM-DD] [camera] [plate]
+    args = sys.argv[1:] + [None] * 3
+    day = datetime.fromisoformat(args[0]) if args[0] else None
+    end = day + timedelta(days=1) if day else None
+    for event in iter_events(start=day, end=end, camera=args[1], plate=args[2]):
+        print(json.dumps(event, ensure_ascii=False))
@@ -0,0 +1,168 @@
+import cv2
+import itertools
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+# cv2 encode parameters per supported format
+ENCODE_PARAMS = {
+    'jpg': cv2.IMWRITE_JPEG_QUALITY,
+    'webp': cv2.IMWRITE_WEBP_QUALITY,
+}
+
+
+class EvidenceWriter:
+    """Background writer for plate evidence images.
+
+    save() picks a collision-free path (microsecond timestamp plus a
+    monotonic counter, sharded into one directory per day) and returns it
+    right away; encoding and disk I/O happen on the writer thread.
+    """
+
+    def __init__(self, image_format='jpg', quality=85, max_queue=200):
+        if image_format not in ENCODE_PARAMS:
+            raise ValueError(f"Unsupported evidence format: {image_format}")
+        self.image_format = image_format
+        self.quality = quality
+        self.images = queue.Queue(maxsize=max_queue)
+        self.running = False
+        self._thread = None
+        self._counter = itertools.count(1)
+        self._known_dirs = set()
+        self._listeners = []
+
+        # Writer statistics
+        self._stats_lock = threading.Lock()
+        self.saved = 0
+        self.dropped = 0
+        self.failed = 0
+        self.total_encode_ms = 0.0
+        self.max_encode_ms = 0.0
+        self.total_write_ms = 0.0
+        self.max_write_ms = 0.0
+        self.total_bytes = 0
+
+    def start(self):
+        """Start the writer thread"""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="EvidenceWriter")
+        self._thread.start()
+        print(f"✅ Evidence writer started ({self.image_format}, quality {self.quality})")
+
+    def stop(self, timeout=5.0):
+        """Write what is queued and stop the writer thread"""
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def add_listener(self, callback):
+        """Call callback(image_path, size) after each image is written"""
+        self._listeners.append(callback)
+
+    def save(self, image_dir, prefix, image, timestamp=None):
+        """Queue an image for writing and return the path it will have, or None if dropped"""
+        moment = datetime.fromtimestamp(timestamp) if timestamp else datetime.now()
+        shard_dir = os.path.join(image_dir, moment.strftime("%Y-%m-%d"))
+        file_name = f"{prefix}_{moment:%Y%m%d_%H%M%S_%f}_{next(self._counter):06d}.{self.image_format}"
+        image_path = os.path.join(shard_dir, file_name)
+
+        try:
+            self.images.put_nowait((shard_dir, image_path, image))
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+            print(f"⚠️ Evidence queue full, dropped image {file_name}")
+            return None
+        return image_path
+
+    def _run(self):
+        while self.running or not self.images.empty():
+            try:
+                shard_dir, image_path, image = self.images.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._write(shard_dir, image_path, image)
+
+    def _write(self, shard_dir, image_path, image):
+        started = time.time()
+        ok, buffer = cv2.imencode(f".{self.image_format}", image,
+                                  [ENCODE_PARAMS[self.image_format], self.quality])
+        encoded = time.time()
+        if not ok:
+            with self._stats_lock:
+                self.failed += 1
+            print(f"❌ Could not encode evidence image: {image_path}")
+            return
+
+        try:
+            if shard_dir not in self._known_dirs:
+                os.makedirs(shard_dir, exist_ok=True)
+                self._known_dirs.add(shard_dir)
+            with open(image_path, "wb") as image_file:
+                image_file.write(buffer.tobytes())
+        except OSError as e:
+            with self._stats_lock:
+                self.failed += 1
+            print(f"❌ Could not write evidence image {image_path}: {e}")
+            return
+        written = time.time()
+
+        encode_ms = (encoded - started) * 1000.0
+        write_ms = (written - encoded) * 1000.0
+        with self._stats_lock:
+            self.saved += 1
+            self.total_bytes += len(buffer)
+            self.total_encode_ms += encode_ms
+            self.max_encode_ms = max(self.max_encode_ms, encode_ms)
+            self.total_write_ms += write_ms
+            self.max_write_ms = max(self.max_write_ms, write_ms)
+
+        for callback in self._listeners:
+            try:
+                callback(image_path, len(buffer))
+            except Exception as e:
+                print(f"Evidence listener error: {e}")
+
+    def get_stats(self):
+        """Encode/write latency, queue depth and image counts"""
+        with self._stats_lock:
+            saved = self.saved or 1
+            return {
+                'queue_depth': self.images.qsize(),
+                'saved': self.saved,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'avg_encode_ms': self.total_encode_ms / saved,
+                'max_encode_ms': self.max_encode_ms,
+                'avg_write_ms': self.total_write_ms / saved,
+                'max_write_ms': self.max_write_ms,
+                'avg_bytes': self.total_bytes / saved,
+            }
+
+
+# Process-wide writer shared by every camera
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_evidence_writer(image_format='jpg', quality=85):
+    """Return the shared evidence writer, starting it on first use"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = EvidenceWriter(image_format=image_format, quality=quality)
+            _writer.start()
+        return _writer
+
+
+def stop_evidence_writer():
+    """Write what is queued and stop the shared writer, if it was started"""
+    with _writer_lock:
+        writer = _writer
+    if writer is not None:
+        writer.stop()
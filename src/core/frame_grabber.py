@@ -0,0 +1,376 @@
+import cv2
+import json
+import os
+import queue
+import threading
+import time
+from urllib.parse import urlparse
+
+
+base_dir = os.path.abspath(os.path.dirname(__file__))
+project_dir = os.path.dirname(os.path.dirname(base_dir))
+# Next to lanes.json: HasilDeteksi/ is pruned by the retention manager
+URL_CACHE_FILE = os.path.join(project_dir, "config", "camera_urls.json")
+
+# Stream paths of common IP camera apps, tried on top of the configured URL
+IP_CAMERA_PATHS = ["", "/video", "/videofeed", "/mjpg/video.mjpg", "/axis-cgi/mjpg/video.cgi"]
+# Per-attempt open/read timeout, OpenCV's default waits ~30 s on a dead URL
+PROBE_TIMEOUT_MS = 3000
+# Delay before reopening a camera, doubled per failed attempt up to the maximum
+RECONNECT_BACKOFF = 1.0
+MAX_BACKOFF = 30.0
+
+
+class CameraURLCache:
+    """Winning stream path per IP camera host, kept in a small JSON file"""
+
+    def __init__(self, path=URL_CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._paths = {}
+        try:
+            with open(path, encoding="utf-8") as cache_file:
+                self._paths = json.load(cache_file)
+        except (OSError, ValueError):
+            pass
+
+    def get(self, host):
+        with self._lock:
+            return self._paths.get(host)
+
+    def put(self, host, stream_path):
+        with self._lock:
+            if stream_path is None:
+                if self._paths.pop(host, None) is None:
+                    return
+            elif self._paths.get(host) == stream_path:
+                return
+            else:
+                self._paths[host] = stream_path
+            data = dict(self._paths)
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # Written aside and swapped in, a crash never leaves half a file
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as cache_file:
+                json.dump(data, cache_file, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not save camera URL cache: {e}")
+
+
+_url_cache = None
+_url_cache_lock = threading.Lock()
+
+
+def get_url_cache():
+    """Return the shared camera URL cache"""
+    global _url_cache
+    with _url_cache_lock:
+        if _url_cache is None:
+            _url_cache = CameraURLCache()
+        return _url_cache
+
+
+def _try_stream_url(url, timeout_ms):
+    """Open url and read one frame within timeout_ms, the capture or None"""
+    if hasattr(cv2, "CAP_PROP_OPEN_TIMEOUT_MSEC"):
+        cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG, [
+            cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout_ms,
+            cv2.CAP_PROP_READ_TIMEOUT_MSEC, timeout_ms,
+        ])
+    else:
+        # OpenCV < 4.5.2 has no per-capture timeouts
+        cap = cv2.VideoCapture(url)
+    # Test if we can actually read a frame
+    if cap.isOpened():
+        ret, _ = cap.read()
+        if ret:
+            return cap
+    cap.release()
+    return None
+
+
+def probe_stream_urls(urls, tag="CAMERA", timeout_ms=PROBE_TIMEOUT_MS):
+    """Try all urls at once, (url, capture) of the first that delivers a frame.
+
+    Captures of the other candidates are released as their attempts end,
+    also after the winner was returned or the overall deadline passed.
+    """
+    results = queue.Queue()
+    lock = threading.Lock()
+    decided = []
+
+    def attempt(url):
+        cap = _try_stream_url(url, timeout_ms)
+        with lock:
+            if cap is not None and not decided:
+                decided.append(url)
+                results.put((url, cap))
+                return
+        if cap is not None:
+            cap.release()
+        results.put((url, None))
+
+    print(f"[{tag}] Probing {len(urls)} stream URLs")
+    for url in urls:
+        threading.Thread(target=attempt, args=(url,), daemon=True, name=f"Probe-{tag}").start()
+
+    # Open and first read each get the timeout, plus slack for thread start-up
+    deadline = time.time() + 2 * timeout_ms / 1000.0 + 1.0
+    for _ in urls:
+        try:
+            url, cap = results.get(timeout=max(deadline - time.time(), 0.0))
+        except queue.Empty:
+            break
+        if cap is not None:
+            return url, cap
+    with lock:
+        if not decided:
+            decided.append(None)
+            return None, None
+    # Won between the timeout and taking the lock
+    while True:
+        url, cap = results.get()
+        if cap is not None:
+            return url, cap
+
+
+def open_capture(camera_source, tag="CAMERA"):
+    """Open a camera source, trying common IP camera URL formats"""
+    if isinstance(camera_source, str) and camera_source.startswith('http'):
+        base_url = camera_source.rstrip('/')
+        host = urlparse(camera_source).netloc
+        cache = get_url_cache()
+
+        # The path that worked last time for this host connects without probing
+        cached_path = cache.get(host)
+        if cached_path is not None:
+            url = base_url + cached_path
+            print(f"[{tag}] Trying cached stream URL: {url}")
+            cap = _try_stream_url(url, PROBE_TIMEOUT_MS)
+            if cap is not None:
+                print(f"✅ [{tag}] Successfully connected to: {url}")
+                return cap
+            cache.put(host, None)
+
+        possible_urls = [base_url + path for path in IP_CAMERA_PATHS]
+        url, cap = probe_stream_urls(possible_urls, tag)
+        if cap is not None:
+            print(f"✅ [{tag}] Successfully connected to: {url}")
+            cache.put(host, url[len(base_url):])
+            return cap
+
+        print(f"❌ [{tag}] Error: Could not connect to camera: {camera_source}")
+        return None
+
+    cap = cv2.VideoCapture(camera_source)
+    if not cap.isOpened():
+        print(f"❌ [{tag}] Error: Could not open camera: {camera_source}")
+        return None
+    return cap
+
+
+class FrameGrabber:
+    """Background reader that always holds only the newest frame of one camera.
+
+    Frames are shared between consumers without copying, so they must be
+    treated as read-only. Copy a frame before drawing on it.
+
+    When the camera stops delivering frames the grabber keeps running and
+    reopens it with exponential backoff, so consumers just wait for the
+    next frame instead of ending their loops.
+    """
+
+    def __init__(self, camera_source, tag=None, fps=60, reconnect_backoff=RECONNECT_BACKOFF,
+                 max_backoff=MAX_BACKOFF):
+        self.camera_source = camera_source
+        self.tag = tag or str(camera_source)
+        self.fps = fps
+        self.cap = None
+        self.frame = None
+        self.frame_id = 0
+        self.frame_time = 0.0
+        self.running = False
+        self.reconnect_backoff = reconnect_backoff
+        self.max_backoff = max_backoff
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        # Connection statistics
+        self.connected = False
+        self.reconnects = 0
+        self.disconnects = 0
+        self.downtime = 0.0
+        self.down_since = None
+
+    def start(self):
+        """Open the camera and start the grabber thread"""
+        if self.running:
+            return True
+
+        if not self._open():
+            return False
+
+        self._stop_event.clear()
+        self.running = True
+        self._thread = threading.Thread(
+            target=self._run,
+            daemon=True,
+            name=f"FrameGrabber-{self.tag}"
+        )
+        self._thread.start()
+        print(f"✅ [{self.tag}] Frame grabber started")
+        return True
+
+    def _open(self):
+        cap = open_capture(self.camera_source, self.tag)
+        if cap is None:
+            return False
+
+        # Keep the driver buffer short so the newest frame is always read
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        cap.set(cv2.CAP_PROP_FPS, self.fps)
+
+        self.cap = cap
+        self.connected = True
+        return True
+
+    def _reconnect(self):
+        """Reopen the camera with exponential backoff until it works or the grabber stops"""
+        self.cap.release()
+        self.cap = None
+        self.connected = False
+        self.disconnects += 1
+        self.down_since = time.time()
+        attempt = 0
+        while self.running:
+            delay = min(self.reconnect_backoff * 2 ** attempt, self.max_backoff)
+            print(f"⚠️ [{self.tag}] Camera lost, reconnecting in {delay:g}s")
+            if self._stop_event.wait(delay):
+                break
+            attempt += 1
+            if self._open():
+                self.reconnects += 1
+                self.downtime += time.time() - self.down_since
+                self.down_since = None
+                print(f"✅ [{self.tag}] Camera reconnected after {attempt} attempt(s)")
+                return True
+        # Stopped while down, the outage ends with the grabber
+        self.downtime += time.time() - self.down_since
+        self.down_since = None
+        return False
+
+    def _run(self):
+        while self.running:
+            ret, frame = self.cap.read()
+            if not ret:
+                print(f"[{self.tag}] Error: Failed to read frame")
+                if not self._reconnect():
+                    break
+                continue
+
+            with self._condition:
+                self.frame = frame
+                self.frame_id += 1
+                self.frame_time = time.time()
+                self._condition.notify_all()
+
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        self.connected = False
+
+    def read(self):
+        """Return (frame_id, frame) of the newest frame without blocking"""
+        with self._condition:
+            return self.frame_id, self.frame
+
+    def wait_for_frame(self, last_id=0, timeout=1.0):
+        """Wait until a frame newer than last_id arrives, then return it"""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.frame_id > last_id or not self.running,
+                timeout
+            )
+            return self.frame_id, self.frame
+
+    def stop(self):
+        """Stop the grabber thread and release the camera"""
+        self.running = False
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        print(f"⏹️ [{self.tag}] Frame grabber stopped")
+
+    def get_stats(self):
+        """Connection state, reconnect count and total downtime"""
+        downtime = self.downtime
+        if self.down_since is not None:
+            downtime += time.time() - self.down_since
+        return {
+            'connected': self.connected,
+            'disconnects': self.disconnects,
+            'reconnects': self.reconnects,
+            'downtime_s': round(downtime, 1),
+        }
+
+
+# Process-wide grabbers, one per camera source, shared by every consumer
+_grabbers = {}
+_grabber_refs = {}
+_grabbers_lock = threading.Lock()
+
+
+def acquire_grabber(camera_source, tag=None):
+    """Get the shared grabber for a camera source, starting it if needed"""
+    with _grabbers_lock:
+        grabber = _grabbers.get(camera_source)
+        if grabber is None:
+            grabber = FrameGrabber(camera_source, tag=tag)
+            _grabbers[camera_source] = grabber
+            _grabber_refs[camera_source] = 0
+
+        # Restart in place if the camera dropped, so existing refs stay valid
+        if not grabber.running and not grabber.start():
+            if _grabber_refs[camera_source] == 0:
+                del _grabbers[camera_source]
+                del _grabber_refs[camera_source]
+            return None
+
+        _grabber_refs[camera_source] += 1
+        return grabber
+
+
+def release_grabber(camera_source):
+    """Drop one reference to a grabber, stopping it when nobody uses it"""
+    with _grabbers_lock:
+        if camera_source not in _grabbers:
+            return
+        _grabber_refs[camera_source] -= 1
+        if _grabber_refs[camera_source] > 0:
+            return
+        grabber = _grabbers.pop(camera_source)
+        del _grabber_refs[camera_source]
+    grabber.stop()
+
+
+def acquire_grabber_retrying(camera_source, tag=None, should_stop=lambda: False):
+    """acquire_grabber, retried with the reconnect backoff until it works or should_stop()"""
+    attempt = 0
+    while not should_stop():
+        grabber = acquire_grabber(camera_source, tag)
+        if grabber is not None:
+            return grabber
+        delay = min(RECONNECT_BACKOFF * 2 ** attempt, MAX_BACKOFF)
+        attempt += 1
+        print(f"⚠️ [{tag or camera_source}] Camera not available, retrying in {delay:g}s")
+        deadline = time.time() + delay
+        while time.time() < deadline and not should_stop():
+            time.sleep(0.1)
+    return None
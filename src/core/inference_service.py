@@ -0,0 +1,138 @@
+import queue
+import threading
+import time
+from src.core.model_registry import get_yolo_model
+
+
+class InferenceRequest:
+    """One frame waiting for detection, plus the slot its boxes come back in"""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.submitted_at = time.time()
+        self.done = threading.Event()
+        self.boxes = None
+        self.error = None
+
+
+class InferenceService:
+    """Collects frames from all cameras into micro-batches for one predict call"""
+
+    def __init__(self, model, max_batch_size=4, max_wait_ms=10, conf=0.25):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.conf = conf
+        self.requests = queue.Queue()
+        self.running = False
+        self._thread = None
+
+        # Batch statistics
+        self._stats_lock = threading.Lock()
+        self.batch_count = 0
+        self.frame_count = 0
+        self.total_wait_ms = 0.0
+        self.max_queue_wait_ms = 0.0
+
+    def start(self):
+        """Start the batching thread"""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="InferenceService")
+        self._thread.start()
+        print(f"✅ Inference service started (batch={self.max_batch_size}, wait={self.max_wait_ms}ms)")
+
+    def stop(self):
+        """Stop the batching thread"""
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def detect(self, frame, timeout=5.0):
+        """Submit a frame and wait for its plate boxes as an (N, 4) xyxy array"""
+        request = InferenceRequest(frame)
+        self.requests.put(request)
+        if not request.done.wait(timeout):
+            raise TimeoutError("Inference service did not answer in time")
+        if request.error is not None:
+            raise request.error
+        return request.boxes
+
+    def _collect_batch(self):
+        try:
+            first = self.requests.get(timeout=0.5)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.time() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while self.running:
+            batch = self._collect_batch()
+            if not batch:
+                continue
+
+            started = time.time()
+            waits = [(started - request.submitted_at) * 1000.0 for request in batch]
+            with self._stats_lock:
+                self.batch_count += 1
+                self.frame_count += len(batch)
+                self.total_wait_ms += sum(waits)
+                self.max_queue_wait_ms = max(self.max_queue_wait_ms, max(waits))
+
+            try:
+                results = self.model.predict([request.frame for request in batch],
+                                             conf=self.conf, verbose=False)
+                for request, result in zip(batch, results):
+                    request.boxes = result.boxes.xyxy.cpu().numpy()
+            except Exception as e:
+                print(f"❌ Batched inference error: {e}")
+                for request in batch:
+                    request.error = e
+
+            for request in batch:
+                request.done.set()
+
+    def get_stats(self):
+        """Batch fill ratio and queue wait times since start"""
+        with self._stats_lock:
+            batches = self.batch_count or 1
+            frames = self.frame_count or 1
+            return {
+                'batches': self.batch_count,
+                'frames': self.frame_count,
+                'avg_batch_size': self.frame_count / batches,
+                'avg_batch_fill': self.frame_count / (batches * self.max_batch_size),
+                'avg_queue_wait_ms': self.total_wait_ms / frames,
+                'max_queue_wait_ms': self.max_queue_wait_ms,
+                'queue_depth': self.requests.qsize(),
+            }
+
+
+# Process-wide service shared by every camera and the preview path
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_inference_service(model_path=None, max_batch_size=4, max_wait_ms=10):
+    """Return the shared inference service, starting it on first use"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = InferenceService(get_yolo_model(model_path),
+                                        max_batch_size=max_batch_size,
+                                        max_wait_ms=max_wait_ms)
+            _service.start()
+        return _service
@@ -0,0 +1,280 @@
+import cv2
+from ultralytics import YOLO
+import easyocr
+import numpy as np
+import time
+import os
+import mysql.connector
+import threading
+from datetime import datetime
+from src.core.frame_grabber import acquire_grabber_retrying, release_grabber
+from src.core.inference_service import get_inference_service
+from src.core.motion_gate import MotionGate
+from src.core.plate_cache import PlateDedupCache
+from src.core.plate_tracker import PlateTracker
+from src.core.ocr_pool import TrackOCRDispatcher, get_ocr_pool
+from src.core.db_writer import get_db_writer
+from src.core.evidence_store import get_evidence_writer
+from src.core.event_log import get_event_log
+from src.core.pipeline_stages import Stage, StageStats, make_queue
+
+class LanePipeline:
+    """Detection pipeline of one lane, parameterised by its LaneConfig.
+
+    The role decides which access events are logged ('entry', 'exit' or
+    'basic') and where evidence goes; ROI and tracker/motion settings come
+    from the config. Detector, OCR pool and writers are process-wide
+    singletons shared by every lane.
+
+    Work runs in stages linked by bounded queues: capture (grabber reader
+    thread) -> frames -> detect (detect_from_camera's thread) -> OCR pool
+    -> tracks -> decide (fuse + dedup) -> events -> persist (DB, evidence,
+    event log). Queue sizes and backpressure policies come from the lane's
+    queues settings.
+    """
+
+    def __init__(self, lane, headless=False):
+        # Print version info
+        print(f"=== {lane.label} CAMERA INITIALIZED ===")
+        print("opencv version:", cv2.__version__)
+        print("ultralytics version:", YOLO._version)
+        print("easyocr version:", easyocr.__version__)
+        print("numpy version:", np.__version__)
+        print("mysql-connector-python version:", mysql.connector.__version__)
+
+        # Camera source configuration
+        self.lane = lane
+        self.camera_source = lane.source  # Can be 0 for local or IP address string
+        self.camera_type = lane.label
+
+        # Setup directories
+        base_dir = os.path.abspath(os.path.dirname(__file__))
+        project_dir = os.path.dirname(os.path.dirname(base_dir))
+        self.image_dir = lane.image_dir
+        self.log_dir = os.path.join(project_dir, "HasilDeteksi")
+        os.makedirs(self.image_dir, exist_ok=True)
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        # Shared batched detector; OCR runs in the shared worker process pool
+        self.detector = get_inference_service()
+        # Repeat reads of the same plate within the TTL are dropped, not the whole camera
+        self.plate_cache = PlateDedupCache(ttl_seconds=lane.dedup_ttl)
+        self.tracker = PlateTracker(**lane.tracker)
+        # Frames drop the oldest when detection falls behind, plate events never drop
+        self.frames = make_queue('frames', lane.queues)
+        self.events = make_queue('events', lane.queues)
+        self.track_ocr = TrackOCRDispatcher(self.camera_type, get_ocr_pool(), self.decide_track,
+                                            make_queue('tracks', lane.queues))
+        self.persist_stage = Stage('persist', self.events, self.persist_event)
+        self.capture_stats = StageStats('capture')
+        self.detect_stats = StageStats('detect')
+        self.detect_errors = 0
+        self.db_writer = get_db_writer()
+        self.evidence = get_evidence_writer()
+        # Buffered JSONL detection log under HasilDeteksi/events
+        self.event_log = get_event_log()
+        # Skip YOLO while nothing moves inside the lane ROI
+        self.motion_gate = MotionGate(roi=lane.roi, **lane.motion)
+        # (frame time, [(box, label)]) of the last processed frame
+        self.latest_overlay = (0.0, [])
+        # Headless: no window and no drawing, frames are only annotated on request
+        self.headless = headless
+        # Shared grabber while detecting, it reconnects the camera by itself
+        self.grabber = None
+        self.should_stop = False  # Flag to control detection loop
+
+    def log_access(self, plate_number, timestamp=None):
+        """Queue the lane's access event for the background DB writer"""
+        # Sessions and access_log are written in batched transactions off the frame loop
+        self.db_writer.submit(self.lane.event_type, plate_number, timestamp)
+
+    def decide_track(self, track):
+        """Decide stage: turn a finished track into a plate event, unless it is a repeat"""
+        final_text, confidence = track.fused_text()
+        # Drop repeat reads of a plate this camera logged moments ago
+        if not final_text or self.plate_cache.seen_recently(final_text, track.last_seen):
+            return
+
+        print(f"[{self.camera_type}] License Plate: {final_text} (track {track.track_id}, conf {confidence:.2f})")
+        self.events.put((final_text, confidence, track, time.time()))
+
+    def persist_event(self, event):
+        """Persist stage: access log, evidence image and event log line of one plate"""
+        final_text, confidence, track, decided_at = event
+
+        self.log_access(final_text, datetime.fromtimestamp(track.last_seen))
+
+        # Encoded and written by the evidence writer thread, the path is known right away
+        image_path = self.evidence.save(self.image_dir, self.lane.image_prefix, track.best_crop, track.last_seen)
+        print(f"[{self.camera_type}] Image saved: {image_path}")
+
+        # One structured line per committed plate, flushed in batches by the event log thread
+        self.event_log.record(
+            self.camera_type, final_text,
+            confidence=confidence,
+            box=track.box,
+            timings={
+                'track_ms': round((track.last_seen - track.first_seen) * 1000.0, 1),
+                'ocr_ms': round(track.ocr_latency * 1000.0, 1),
+                'commit_delay_ms': round((decided_at - track.last_seen) * 1000.0, 1),
+                'persist_wait_ms': round((time.time() - decided_at) * 1000.0, 1),
+            },
+            image_path=image_path,
+            timestamp=track.last_seen,
+            track_id=track.track_id,
+            hits=track.hits,
+        )
+
+    def annotate(self, frame, max_age=1.0):
+        """Draw the latest tracked plates onto a frame, for display or preview subscribers"""
+        color = self.lane.color
+        overlay_time, overlay = self.latest_overlay
+        if time.time() - overlay_time <= max_age:
+            for (x1, y1, x2, y2), label in overlay:
+                cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+                cv2.putText(frame, label, (x1, y1 - 10),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+        cv2.putText(frame, f"{self.camera_type} CAMERA", (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
+        return frame
+
+    def capture_frames(self, grabber):
+        """Capture stage: move new grabber frames into the frames queue"""
+        last_frame_id = 0
+        while not self.should_stop:
+            frame_id, frame = grabber.wait_for_frame(last_frame_id)
+            if frame_id == last_frame_id:
+                # Only a stopped grabber ends capture, a lost camera is reconnected in place
+                if not grabber.running:
+                    print(f"[{self.camera_type}] Error: Frame grabber stopped")
+                    break
+                continue
+            last_frame_id = frame_id
+            captured_at = time.time()
+            # drop_oldest by default: a slow detect stage skips stale frames instead of lagging
+            self.frames.put((frame_id, frame, captured_at))
+            self.capture_stats.record(captured_at)
+
+    def detect_frame(self, frame, current_time):
+        """Detect stage: motion gate, batched YOLO and tracking of one frame"""
+        if self.motion_gate.should_detect(frame, current_time):
+            try:
+                # Batched together with the other cameras' frames
+                boxes = self.detector.detect(frame)
+            except Exception as e:
+                # A timed-out or failed batch costs this frame, not the lane
+                self.detect_errors += 1
+                if self.detect_errors == 1 or self.detect_errors % 100 == 0:
+                    print(f"❌ [{self.camera_type}] Detection error, frame skipped "
+                          f"({self.detect_errors} so far): {e}")
+                return
+
+            # OCR only the crops the tracker picks, each vehicle is committed once its track ends
+            ocr_requests, finished_tracks = self.tracker.update(boxes, frame, current_time)
+            # OCR runs in the pool, finished tracks go on to the decide stage
+            self.track_ocr.request_ocr(ocr_requests, current_time)
+            for track in finished_tracks:
+                self.track_ocr.finish(track)
+        else:
+            # Nothing moved: a car waiting at the barrier keeps its track instead of
+            # ageing out and being logged a second time when it drives off
+            self.tracker.hold(current_time)
+
+        overlay = []
+        for track in self.tracker.tracks.values():
+            if track.last_seen != current_time:
+                continue
+            plate_text, _ = track.fused_text()
+            overlay.append((track.box, f"{self.camera_type} #{track.track_id} {plate_text}"))
+        # Read by the web preview so it can draw these boxes instead of running YOLO again
+        self.latest_overlay = (current_time, overlay)
+
+    def detect_from_camera(self):
+        """Main detection loop for the lane's camera"""
+        # Frames come from the shared grabber so preview and detection use one capture
+        # A camera that is not up yet is retried like a lost one, until Stop
+        grabber = acquire_grabber_retrying(self.camera_source, self.camera_type,
+                                           should_stop=lambda: self.should_stop)
+        if grabber is None:
+            print(f"[{self.camera_type}] Detection stopped before the camera opened")
+            return
+
+        print(f"✅ [{self.camera_type}] Camera opened successfully")
+        self.grabber = grabber
+        self.capture_stats = StageStats('capture')
+        self.detect_stats = StageStats('detect')
+        self.persist_stage.start()
+        self.track_ocr.start()
+        capture_thread = threading.Thread(target=self.capture_frames, args=(grabber,), daemon=True,
+                                          name=f"Capture-{self.camera_type}")
+        capture_thread.start()
+
+        try:
+            while True:
+                if self.should_stop:
+                    print(f"[{self.camera_type}] Detection stopped by user")
+                    break
+
+                item = self.frames.get(timeout=0.5)
+                if item is None:
+                    if not capture_thread.is_alive():
+                        break
+                    continue
+                _, frame, current_time = item
+
+                started = time.time()
+                self.detect_frame(frame, current_time)
+                self.detect_stats.record(started)
+
+                if not self.headless:
+                    # The grabber frame is shared, draw on a private copy
+                    cv2.imshow(f"{self.camera_type.capitalize()} Detection", self.annotate(frame.copy()))
+                    if cv2.waitKey(1) & 0xFF == ord('q'):
+                        break
+        finally:
+            # Drain in stage order: capture, open tracks, OCR + decide, then persist
+            self.should_stop = True
+            capture_thread.join(timeout=2.0)
+            try:
+                for track in self.tracker.flush():
+                    self.track_ocr.finish(track)
+            finally:
+                self.track_ocr.close()
+                self.persist_stage.stop()
+                release_grabber(self.camera_source)
+
+        camera_stats = grabber.get_stats()
+        if camera_stats['reconnects']:
+            print(f"📊 [{self.camera_type}] Camera reconnected {camera_stats['reconnects']} times, "
+                  f"{camera_stats['downtime_s']:.0f}s down in total")
+        gate_stats = self.motion_gate.get_stats()
+        print(f"📊 [{self.camera_type}] Motion gate skipped {gate_stats['skip_ratio']:.0%} of frames "
+              f"({gate_stats['skips']} skipped, {gate_stats['hits']} detected)")
+        frame_stats = self.frames.get_stats()
+        print(f"📊 [{self.camera_type}] Frames queue dropped {frame_stats['dropped']} of "
+              f"{frame_stats['puts']} captured frames, avg occupancy {frame_stats['avg_occupancy']:.0%}")
+        if not self.headless:
+            cv2.destroyAllWindows()
+
+    def get_stats(self):
+        """Runtime statistics of this lane and the shared services it uses"""
+        stages = {
+            'capture': self.capture_stats.get_stats(),
+            'detect': self.detect_stats.get_stats(),
+        }
+        stages.update(self.track_ocr.get_stage_stats())
+        stages['persist'] = self.persist_stage.stats.get_stats()
+        return {
+            'camera': self.grabber.get_stats() if self.grabber is not None else {},
+            'stages': stages,
+            'detect_errors': self.detect_errors,
+            'queues': {queue.name: queue.get_stats()
+                       for queue in (self.frames, self.track_ocr.commit_queue, self.events)},
+            'motion_gate': self.motion_gate.get_stats(),
+            'duplicates_dropped': self.plate_cache.duplicates,
+            'ocr_pool': self.track_ocr.ocr_pool.get_stats(),
+            'inference': self.detector.get_stats(),
+            'db_writer': self.db_writer.get_stats(),
+            'evidence': self.evidence.get_stats(),
+            'event_log': self.event_log.get_stats(),
+        }
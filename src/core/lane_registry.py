@@ -0,0 +1,189 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+base_dir = os.path.abspath(os.path.dirname(__file__))
+project_dir = os.path.dirname(os.path.dirname(base_dir))
+IMAGE_ROOT = os.path.join(project_dir, "Captured Image")
+DEFAULT_LANES_FILE = os.path.join(project_dir, "config", "lanes.json")
+
+# How each role logs, stores evidence and is drawn (BGR colors)
+ROLE_SETTINGS = {
+    'entry': {'event_type': 'entry', 'image_subdir': "Entry", 'image_prefix': "entry_plate",
+              'color': (0, 255, 0), 'ui_color': 'green'},
+    'exit': {'event_type': 'exit', 'image_subdir': "Exit", 'image_prefix': "exit_plate",
+             'color': (0, 0, 255), 'ui_color': 'red'},
+    'basic': {'event_type': 'basic', 'image_subdir': "", 'image_prefix': "detected_plate",
+              'color': (0, 255, 0), 'ui_color': 'blue'},
+}
+
+# The two lanes the app always had, used when no lanes file exists
+DEFAULT_LANES = [
+    {'name': "entry", 'source': 0, 'role': "entry"},
+    {'name': "exit", 'source': 1, 'role': "exit"},
+]
+
+# "thread" runs lane pipelines inside the app process, "process" gives each lane its own
+DETECTION_MODES = ("thread", "process")
+
+# Limits on the resources all lanes share
+DEFAULT_RESOURCES = {
+    'detection_mode': "thread",
+    'inference_max_batch_size': 8,
+    'inference_max_wait_ms': 10,
+    'ocr_workers': 2,
+    'worker_ocr_workers': 1,
+}
+
+
+def parse_camera_source(source):
+    """Camera index for digit strings, the string (URL/path) otherwise"""
+    if isinstance(source, str) and source.strip().isdigit():
+        return int(source.strip())
+    return source
+
+
+class LaneConfig:
+    """Configuration of one camera lane: source, role, ROI and tuning settings"""
+
+    def __init__(self, name, source, role="entry", roi=None, label=None, image_dir=None,
+                 dedup_ttl=30.0, tracker=None, motion=None, queues=None, retention=None):
+        if role not in ROLE_SETTINGS:
+            raise ValueError(f"Lane {name}: unknown role '{role}', expected one of {sorted(ROLE_SETTINGS)}")
+        self.name = name
+        self.source = parse_camera_source(source)
+        self.role = role
+        self.roi = tuple(roi) if roi else None
+        self.label = label or name.upper()
+        role_settings = ROLE_SETTINGS[role]
+        if image_dir is None:
+            image_dir = os.path.join(IMAGE_ROOT, role_settings['image_subdir'])
+            # Extra lanes of a role get their own folder inside the role's folder
+            if name != role:
+                image_dir = os.path.join(image_dir, name)
+        self.image_dir = image_dir
+        self.dedup_ttl = dedup_ttl
+        self.tracker = dict(tracker or {})
+        self.motion = dict(motion or {})
+        # Per-queue {'maxsize', 'policy'} overrides of pipeline_stages.DEFAULT_QUEUES
+        self.queues = {name: dict(settings) for name, settings in (queues or {}).items()}
+        # {'max_age_days', 'max_bytes'} overrides of this lane's evidence budget
+        self.retention = dict(retention or {})
+
+    @property
+    def event_type(self):
+        return ROLE_SETTINGS[self.role]['event_type']
+
+    @property
+    def image_prefix(self):
+        return ROLE_SETTINGS[self.role]['image_prefix']
+
+    @property
+    def color(self):
+        return ROLE_SETTINGS[self.role]['color']
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'source': self.source,
+            'role': self.role,
+            'roi': list(self.roi) if self.roi else None,
+            'label': self.label,
+            'image_dir': self.image_dir,
+            'dedup_ttl': self.dedup_ttl,
+            'tracker': self.tracker,
+            'motion': self.motion,
+            'queues': self.queues,
+            'retention': self.retention,
+        }
+
+
+def load_lane_configs(path=DEFAULT_LANES_FILE):
+    """Lane configs and shared resource limits from a JSON file, defaults if it is missing"""
+    data = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as config_file:
+            data = json.load(config_file)
+
+    lanes = [LaneConfig.from_dict(lane) for lane in data.get('lanes', DEFAULT_LANES)]
+    names = [lane.name for lane in lanes]
+    labels = [lane.label for lane in lanes]
+    # Names key the preview routes, labels key the OCR pool's result callbacks
+    if len(set(names)) != len(names) or len(set(labels)) != len(labels):
+        raise ValueError(f"Lane names and labels must be unique: {names}")
+
+    resources = dict(DEFAULT_RESOURCES)
+    resources.update(data.get('resources', {}))
+    if resources['detection_mode'] not in DETECTION_MODES:
+        raise ValueError(f"Unknown detection_mode '{resources['detection_mode']}', "
+                         f"expected one of {DETECTION_MODES}")
+    return lanes, resources
+
+
+class Lane:
+    """Runtime state of one configured lane"""
+
+    def __init__(self, config):
+        self.config = config
+        self.source = config.source
+        self.preview_active = False
+        self.grabber = None
+        self.pipeline = None
+        self.worker = None
+        # Set while a worker process is being started, the preview must not open the camera then
+        self.worker_starting = False
+        # Serialises preview grabber acquisition with handing the camera to a worker
+        self.lock = threading.Lock()
+        self.thread = None
+        self.detection_running = False
+        self.preview_frame_id = None
+
+    @property
+    def name(self):
+        return self.config.name
+
+    def pipeline_config(self):
+        """Config for a new pipeline, with the source currently set in the UI"""
+        data = self.config.to_dict()
+        data['source'] = self.source
+        return LaneConfig.from_dict(data)
+
+
+class LaneRegistry:
+    """Ordered set of lanes plus the limits on resources they share.
+
+    Every lane's pipeline uses the same inference service, OCR pool, DB
+    writer, evidence writer and event log, so adding a lane adds its
+    grabber, detection and commit threads but no model copies.
+    """
+
+    def __init__(self, configs, resources=None):
+        self.lanes = OrderedDict((config.name, Lane(config)) for config in configs)
+        self.resources = dict(DEFAULT_RESOURCES)
+        self.resources.update(resources or {})
+
+    @classmethod
+    def from_file(cls, path=None):
+        lanes, resources = load_lane_configs(path or DEFAULT_LANES_FILE)
+        return cls(lanes, resources)
+
+    def get(self, name):
+        return self.lanes.get(name)
+
+    def __iter__(self):
+        return iter(self.lanes.values())
+
+    def __len__(self):
+        return len(self.lanes)
+
+    def inference_options(self):
+        """Arguments for get_inference_service: one batch slot per lane, up to the limit"""
+        return {
+            'max_batch_size': max(1, min(len(self.lanes), self.resources['inference_max_batch_size'])),
+            'max_wait_ms': self.resources['inference_max_wait_ms'],
+        }
@@ -0,0 +1,110 @@
+import threading
+import time
+from src.core.db_pool import get_db_pool
+from src.core.plate_match import PlateMatchIndex, normalize_plate
+
+
+class MemberIndex:
+    """In-process index of member plates, so member/guest is a hash lookup
+    (with a fuzzy fallback for reads with one 0/O, 1/I or 8/B mix-up).
+
+    Loaded once, updated write-through by add_member and refreshed in the
+    background whenever the member_list checksum changes.
+    """
+
+    def __init__(self, refresh_interval=60.0):
+        self.refresh_interval = refresh_interval
+        self.loaded = False
+        self.version = None
+        self._plates = set()
+        # Resolves OCR reads with one confusable character swapped
+        self._matcher = PlateMatchIndex(max_distance=1)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.running = False
+
+    def _read_version(self, cursor):
+        # Changes whenever a row is added, removed or edited
+        cursor.execute("CHECKSUM TABLE member_list")
+        row = cursor.fetchone()
+        return row[1] if row else None
+
+    def load(self):
+        """(Re)load every member plate from the database"""
+        with get_db_pool().connection() as conn:
+            cursor = conn.cursor()
+            version = self._read_version(cursor)
+            cursor.execute("SELECT plate_number FROM member_list")
+            plates = {normalize_plate(row[0]) for row in cursor.fetchall()}
+            cursor.close()
+
+        self._matcher.rebuild(plates)
+        with self._lock:
+            self._plates = plates
+            self.version = version
+            self.loaded = True
+        print(f"✅ Member index loaded: {len(plates)} plates")
+
+    def refresh(self):
+        """Reload only if member_list changed since the last load"""
+        with get_db_pool().connection() as conn:
+            cursor = conn.cursor()
+            version = self._read_version(cursor)
+            cursor.close()
+        if not self.loaded or version != self.version:
+            self.load()
+
+    def match(self, plate_number):
+        """Member plate an OCR read refers to (exact or one confusable swap away), or None"""
+        key = normalize_plate(plate_number)
+        if key in self._plates:
+            return key
+        return self._matcher.best_match(key)
+
+    def is_member(self, plate_number):
+        return self.match(plate_number) is not None
+
+    def add(self, plate_number):
+        """Write-through update after a member was inserted"""
+        with self._lock:
+            self._plates.add(normalize_plate(plate_number))
+        self._matcher.add(normalize_plate(plate_number))
+
+    def start(self):
+        """Start the periodic background refresh"""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._refresh_loop, daemon=True, name="MemberIndexRefresh")
+        self._thread.start()
+
+    def _refresh_loop(self):
+        while self.running:
+            time.sleep(self.refresh_interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Member index refresh error: {e}")
+
+    def __len__(self):
+        return len(self._plates)
+
+
+# Process-wide index shared by the app and the DB writer
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_member_index():
+    """Return the shared member index, loading it on first use"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = MemberIndex()
+            try:
+                _index.load()
+            except Exception as e:
+                # The refresh loop keeps retrying until the database is reachable
+                print(f"⚠️ Could not load member index: {e}")
+            _index.start()
+        return _index
@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+import numpy as np
+from ultralytics import YOLO
+import easyocr
+
+base_dir = os.path.abspath(os.path.dirname(__file__))
+project_dir = os.path.dirname(os.path.dirname(base_dir))
+DEFAULT_MODEL_PATH = os.path.join(project_dir, "yolov10", "runs", "detect", "train10", "weights", "best.pt")
+DEFAULT_OCR_LANGUAGES = ('en', 'id')
+
+
+class SharedYOLO:
+    """Thread-safe handle to a YOLO model shared by every camera"""
+
+    def __init__(self, model, model_path):
+        self.model = model
+        self.model_path = model_path
+        self.lock = threading.Lock()
+
+    def predict(self, *args, **kwargs):
+        with self.lock:
+            return self.model.predict(*args, **kwargs)
+
+
+class SharedOCRReader:
+    """Thread-safe handle to an EasyOCR reader shared by every camera"""
+
+    def __init__(self, reader, languages):
+        self.reader = reader
+        self.languages = languages
+        self.lock = threading.Lock()
+
+    def readtext(self, *args, **kwargs):
+        with self.lock:
+            return self.reader.readtext(*args, **kwargs)
+
+    def readtext_batched(self, *args, **kwargs):
+        with self.lock:
+            return self.reader.readtext_batched(*args, **kwargs)
+
+
+# Loaded models, keyed by weights path / language list
+_yolo_models = {}
+_ocr_readers = {}
+_registry_lock = threading.Lock()
+
+
+def get_yolo_model(model_path=None):
+    """Return the shared YOLO model, loading and warming it up on first use"""
+    model_path = os.path.abspath(model_path or DEFAULT_MODEL_PATH)
+    with _registry_lock:
+        handle = _yolo_models.get(model_path)
+        if handle is None:
+            start = time.time()
+            model = YOLO(model_path)
+            # Dummy inference so the first real frame doesn't pay for setup
+            model.predict(np.zeros((640, 640, 3), dtype=np.uint8), verbose=False)
+            handle = SharedYOLO(model, model_path)
+            _yolo_models[model_path] = handle
+            print(f"✅ YOLO model loaded and warmed up in {time.time() - start:.1f}s: {model_path}")
+        return handle
+
+
+def get_ocr_reader(languages=None):
+    """Return the shared EasyOCR reader, loading and warming it up on first use"""
+    languages = tuple(languages or DEFAULT_OCR_LANGUAGES)
+    with _registry_lock:
+        handle = _ocr_readers.get(languages)
+        if handle is None:
+            start = time.time()
+            reader = easyocr.Reader(list(languages))
+            reader.readtext(np.zeros((64, 256), dtype=np.uint8))
+            handle = SharedOCRReader(reader, languages)
+            _ocr_readers[languages] = handle
+            print(f"✅ EasyOCR reader loaded and warmed up in {time.time() - start:.1f}s: {list(languages)}")
+        return handle
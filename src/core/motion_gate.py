@@ -0,0 +1,74 @@
+import cv2
+import numpy as np
+import threading
+import time
+
+
+class MotionGate:
+    """Cheap background-subtraction gate that decides when YOLO needs to run.
+
+    The lane ROI is given as fractions of the frame (x1, y1, x2, y2) so the
+    same setting works for any camera resolution.
+    """
+
+    def __init__(self, roi=None, scale_width=160, pixel_threshold=25,
+                 min_changed_ratio=0.01, hold_seconds=2.0, background_alpha=0.05):
+        self.roi = roi or (0.0, 0.0, 1.0, 1.0)
+        self.scale_width = scale_width
+        self.pixel_threshold = pixel_threshold
+        self.min_changed_ratio = min_changed_ratio
+        self.hold_seconds = hold_seconds
+        self.background_alpha = background_alpha
+        self.background = None
+        self.last_motion_time = 0.0
+
+        # Gate statistics
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.skips = 0
+
+    def _prepare(self, frame):
+        height, width = frame.shape[:2]
+        x1, y1, x2, y2 = self.roi
+        region = frame[int(y1 * height):int(y2 * height), int(x1 * width):int(x2 * width)]
+
+        gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY) if region.ndim == 3 else region
+        scale = self.scale_width / float(gray.shape[1])
+        small = cv2.resize(gray, (self.scale_width, max(1, int(gray.shape[0] * scale))),
+                           interpolation=cv2.INTER_AREA)
+        return cv2.GaussianBlur(small, (5, 5), 0)
+
+    def should_detect(self, frame, now=None):
+        """Return True when the lane ROI changed recently enough to run detection"""
+        now = now if now is not None else time.time()
+        small = self._prepare(frame)
+
+        if self.background is None or self.background.shape != small.shape:
+            self.background = small.astype(np.float32)
+            self.last_motion_time = now
+        else:
+            diff = cv2.absdiff(small, cv2.convertScaleAbs(self.background))
+            changed_ratio = np.count_nonzero(diff > self.pixel_threshold) / float(diff.size)
+            # Slowly absorb lighting changes and parked cars into the background
+            cv2.accumulateWeighted(small, self.background, self.background_alpha)
+            if changed_ratio >= self.min_changed_ratio:
+                self.last_motion_time = now
+
+        # Keep detecting for a while after motion so a car that stops is still read
+        hit = (now - self.last_motion_time) <= self.hold_seconds
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.skips += 1
+        return hit
+
+    def get_stats(self):
+        """Hit/skip counts and the share of frames where YOLO was skipped"""
+        with self._stats_lock:
+            total = self.hits + self.skips
+            return {
+                'hits': self.hits,
+                'skips': self.skips,
+                'skip_ratio': self.skips / total if total else 0.0,
+            }
@@ -0,0 +1,352 @@
+import multiprocessing as mp
+import numpy as np
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from src.core.model_registry import DEFAULT_OCR_LANGUAGES
+from src.core.pipeline_stages import Stage, StageStats, make_queue
+
+
+def _ocr_worker(task_queue, result_queue, languages):
+    """Worker process: owns its own EasyOCR reader and recognises plate crops"""
+    # Imported here so only the worker processes pay for loading EasyOCR
+    from src.core.model_registry import get_ocr_reader
+    from src.core.plate_ocr import read_plates_batched
+
+    reader = get_ocr_reader(languages)
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        job_id, shm_name, layout = task
+        started = time.time()
+        try:
+            shm = shared_memory.SharedMemory(name=shm_name)
+            try:
+                crops = [
+                    np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=offset).copy()
+                    for offset, shape in layout
+                ]
+            finally:
+                shm.close()
+            reads = read_plates_batched(reader, crops)
+            error = None
+        except Exception as e:
+            reads = [("", 0.0)] * len(layout)
+            error = str(e)
+        result_queue.put((job_id, reads, time.time() - started, error))
+
+
+class OCRJob:
+    """Crops of one frame handed to the pool, with where the answer goes"""
+
+    def __init__(self, job_id, camera, frame_time, track_ids, shm):
+        self.job_id = job_id
+        self.camera = camera
+        self.frame_time = frame_time
+        self.track_ids = track_ids
+        self.shm = shm
+        self.submitted_at = time.time()
+
+
+class OCRResult:
+    """Plate reads for one job, tagged with camera and frame timestamp"""
+
+    def __init__(self, camera, frame_time, track_ids, reads, latency, error=None):
+        self.camera = camera
+        self.frame_time = frame_time
+        self.track_ids = track_ids
+        self.reads = reads
+        self.latency = latency
+        self.error = error
+
+
+class OCRProcessPool:
+    """Pool of OCR worker processes fed with plate crops through shared memory.
+
+    Results are delivered on a listener thread to the callback each camera
+    registered, so detection threads never wait on OCR. The listener also
+    restarts workers that died and answers jobs older than job_timeout
+    with empty reads, so their tracks still commit.
+    """
+
+    def __init__(self, num_workers=2, languages=DEFAULT_OCR_LANGUAGES, job_timeout=30.0,
+                 check_interval=1.0):
+        self.num_workers = num_workers
+        self.languages = tuple(languages)
+        self.job_timeout = job_timeout
+        self.check_interval = check_interval
+        self.running = False
+        self._context = mp.get_context("spawn")
+        self._task_queue = None
+        self._result_queue = None
+        self._workers = []
+        self._listener = None
+        self._callbacks = {}
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._next_job_id = 1
+
+        # Pool statistics
+        self.completed = 0
+        self.total_latency = 0.0
+        self.restarted_workers = 0
+        self.expired_jobs = 0
+
+    def start(self):
+        """Start the worker processes and the result listener"""
+        if self.running:
+            return
+        self._task_queue = self._context.Queue()
+        self._result_queue = self._context.Queue()
+        self._workers = [self._spawn_worker(index) for index in range(self.num_workers)]
+
+        self.running = True
+        self._listener = threading.Thread(target=self._listen, daemon=True, name="OCRResultListener")
+        self._listener.start()
+        print(f"✅ OCR process pool started with {self.num_workers} workers")
+
+    def _spawn_worker(self, index):
+        worker = self._context.Process(
+            target=_ocr_worker,
+            args=(self._task_queue, self._result_queue, self.languages),
+            daemon=True,
+            name=f"OCRWorker-{index}"
+        )
+        worker.start()
+        return worker
+
+    def stop(self):
+        """Stop workers and release any shared memory still in flight"""
+        if not self.running:
+            return
+        self.running = False
+        # Listener first, so it cannot restart a worker that is being stopped
+        if self._listener is not None:
+            self._listener.join(timeout=2.0)
+        for _ in self._workers:
+            self._task_queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout=5.0)
+            if worker.is_alive():
+                worker.terminate()
+        self._workers = []
+        with self._lock:
+            for job in self._jobs.values():
+                self._release(job)
+            self._jobs = {}
+
+    def register_camera(self, camera, callback):
+        """Deliver results for this camera to callback(result)"""
+        with self._lock:
+            self._callbacks[camera] = callback
+
+    def unregister_camera(self, camera, callback=None):
+        """Stop delivering results for this camera.
+
+        With a callback, only that callback is removed: a pipeline that is
+        shutting down must not drop the one that replaced it for the lane.
+        """
+        with self._lock:
+            if callback is None or self._callbacks.get(camera) == callback:
+                self._callbacks.pop(camera, None)
+
+    def submit(self, camera, frame_time, track_ids, crops):
+        """Queue plate crops for OCR; the result arrives on the camera's callback"""
+        layout = []
+        offset = 0
+        for crop in crops:
+            layout.append((offset, crop.shape))
+            offset += crop.nbytes
+
+        # One block per job, crops packed back to back
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (crop_offset, shape), crop in zip(layout, crops):
+            target = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=crop_offset)
+            target[:] = crop
+
+        with self._lock:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            self._jobs[job_id] = OCRJob(job_id, camera, frame_time, track_ids, shm)
+        self._task_queue.put((job_id, shm.name, layout))
+        return job_id
+
+    def _release(self, job):
+        job.shm.close()
+        job.shm.unlink()
+
+    def _listen(self):
+        last_check = time.time()
+        while self.running:
+            if time.time() - last_check >= self.check_interval:
+                last_check = time.time()
+                self._restart_dead_workers()
+                self._expire_jobs()
+
+            try:
+                job_id, reads, worker_time, error = self._result_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            with self._lock:
+                job = self._jobs.pop(job_id, None)
+            # Already answered when it expired
+            if job is None:
+                continue
+
+            latency = time.time() - job.submitted_at
+            self.completed += 1
+            self.total_latency += latency
+            if error:
+                print(f"❌ [{job.camera}] OCR worker error: {error}")
+            self._deliver(job, reads, latency, error)
+
+    def _restart_dead_workers(self):
+        """Replace workers that exited, e.g. killed for memory or crashed inside EasyOCR"""
+        for index, worker in enumerate(self._workers):
+            if worker.is_alive() or not self.running:
+                continue
+            print(f"⚠️ {worker.name} died (exit code {worker.exitcode}), restarting it")
+            self._workers[index] = self._spawn_worker(index)
+            self.restarted_workers += 1
+
+    def _expire_jobs(self):
+        """Answer jobs a worker never finished with empty reads, so their tracks still commit"""
+        now = time.time()
+        with self._lock:
+            expired = [job for job in self._jobs.values() if now - job.submitted_at > self.job_timeout]
+            for job in expired:
+                del self._jobs[job.job_id]
+        for job in expired:
+            self.expired_jobs += 1
+            print(f"⚠️ [{job.camera}] OCR job {job.job_id} timed out after {self.job_timeout:.0f}s")
+            self._deliver(job, [("", 0.0)] * len(job.track_ids), now - job.submitted_at, "OCR timed out")
+
+    def _deliver(self, job, reads, latency, error):
+        """Free the job's shared memory and hand its reads to the camera's callback"""
+        self._release(job)
+        with self._lock:
+            callback = self._callbacks.get(job.camera)
+        if callback is not None:
+            try:
+                callback(OCRResult(job.camera, job.frame_time, job.track_ids, reads, latency, error))
+            except Exception as e:
+                print(f"❌ [{job.camera}] OCR result handler error: {e}")
+
+    def get_stats(self):
+        """Jobs in flight, average OCR latency and worker health"""
+        with self._lock:
+            pending = len(self._jobs)
+        return {
+            'pending_jobs': pending,
+            'completed_jobs': self.completed,
+            'avg_latency_ms': self.total_latency / self.completed * 1000.0 if self.completed else 0.0,
+            'expired_jobs': self.expired_jobs,
+            'workers_alive': sum(1 for worker in self._workers if worker.is_alive()),
+            'restarted_workers': self.restarted_workers,
+        }
+
+
+class TrackOCRDispatcher:
+    """Glue between one camera's tracker and the OCR pool.
+
+    Sends picked crops to the pool, folds the reads back into their tracks
+    and queues finished tracks on commit_queue once all their OCR is back.
+    A decide stage thread hands them to commit_fn, so the detection thread
+    only captures and detects.
+    """
+
+    def __init__(self, camera, ocr_pool, commit_fn, commit_queue=None):
+        self.camera = camera
+        self.ocr_pool = ocr_pool
+        self.commit_fn = commit_fn
+        self.pending_tracks = {}
+        # Blocks when full, a finished track is never dropped
+        self.commit_queue = commit_queue if commit_queue is not None else make_queue('tracks')
+        self.ocr_stats = StageStats('ocr')
+        self._lock = threading.Lock()
+        self._decide_stage = Stage('decide', self.commit_queue, self._commit)
+
+    def start(self):
+        self.ocr_pool.register_camera(self.camera, self.on_result)
+        self.ocr_stats = StageStats('ocr')
+        self._decide_stage.start()
+
+    def request_ocr(self, ocr_requests, frame_time):
+        """Send the tracker's (track, crop) picks of one frame to the pool"""
+        if not ocr_requests:
+            return
+        with self._lock:
+            for track, _ in ocr_requests:
+                track.pending_ocr += 1
+                self.pending_tracks[track.track_id] = track
+        self.ocr_pool.submit(self.camera, frame_time,
+                             [track.track_id for track, _ in ocr_requests],
+                             [crop for _, crop in ocr_requests])
+
+    def on_result(self, result):
+        """Fold pool reads into their tracks, runs on the pool's listener thread"""
+        now = time.time()
+        self.ocr_stats.record(now - result.latency, now)
+        ready = []
+        with self._lock:
+            for track_id, (text, confidence) in zip(result.track_ids, result.reads):
+                track = self.pending_tracks.get(track_id)
+                if track is None:
+                    continue
+                track.add_read(text, confidence)
+                track.ocr_latency = max(track.ocr_latency, result.latency)
+                track.pending_ocr -= 1
+                if track.pending_ocr == 0:
+                    del self.pending_tracks[track_id]
+                    if track.finished:
+                        ready.append(track)
+        for track in ready:
+            self.commit_queue.put(track)
+
+    def finish(self, track):
+        """Commit a track that ended, as soon as its OCR is back"""
+        with self._lock:
+            track.finished = True
+            if track.pending_ocr:
+                return
+        self.commit_queue.put(track)
+
+    def _commit(self, track):
+        try:
+            self.commit_fn(track)
+        except Exception as e:
+            print(f"❌ [{self.camera}] Commit error: {e}")
+
+    def close(self, timeout=5.0):
+        """Wait for OCR still in flight, then drain and stop the decide stage"""
+        deadline = time.time() + timeout
+        while self.pending_tracks and time.time() < deadline:
+            time.sleep(0.05)
+        self.ocr_pool.unregister_camera(self.camera, self.on_result)
+        self._decide_stage.stop(timeout=timeout)
+
+    def get_stage_stats(self):
+        """Stats of the OCR and decide stages of this camera"""
+        return {
+            'ocr': self.ocr_stats.get_stats(),
+            'decide': self._decide_stage.stats.get_stats(),
+        }
+
+
+# Process-wide pool shared by every camera
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_ocr_pool(num_workers=2):
+    """Return the shared OCR pool, starting it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = OCRProcessPool(num_workers=num_workers)
+            _pool.start()
+        return _pool
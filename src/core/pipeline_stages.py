@@ -0,0 +1,174 @@
+import collections
+import threading
+import time
+
+# What put() does when a queue is full
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+QUEUE_POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+
+# Queue sizes and policies between a lane's stages, overridable per lane
+DEFAULT_QUEUES = {
+    # Stale frames are worthless, detection always gets the newest ones
+    'frames': {'maxsize': 2, 'policy': DROP_OLDEST},
+    # Finished tracks and plate decisions must never be lost
+    'tracks': {'maxsize': 256, 'policy': BLOCK},
+    'events': {'maxsize': 256, 'policy': BLOCK},
+}
+
+
+class BoundedQueue:
+    """Bounded FIFO between two stages with a backpressure policy.
+
+    block waits for room, drop_oldest evicts the head to make room and
+    drop_newest discards the item being put. Occupancy is sampled on
+    every put so get_stats() shows how full the queue runs on average.
+    """
+
+    def __init__(self, name, maxsize=16, policy=BLOCK):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown queue policy for {name}: {policy}")
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self._items = collections.deque()
+        self._condition = threading.Condition()
+
+        # Queue statistics
+        self.puts = 0
+        self.gets = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.total_depth = 0
+        self.blocked_ms = 0.0
+
+    def put(self, item, timeout=None):
+        """Add an item, returns False if it was dropped or the wait timed out"""
+        with self._condition:
+            if len(self._items) >= self.maxsize:
+                if self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                if self.policy == DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+                else:
+                    started = time.time()
+                    ok = self._condition.wait_for(lambda: len(self._items) < self.maxsize, timeout)
+                    self.blocked_ms += (time.time() - started) * 1000.0
+                    if not ok:
+                        return False
+            self._items.append(item)
+            self.puts += 1
+            depth = len(self._items)
+            self.total_depth += depth
+            self.max_depth = max(self.max_depth, depth)
+            self._condition.notify_all()
+            return True
+
+    def get(self, timeout=None):
+        """Next item, or None after timeout seconds without one"""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._items, timeout):
+                return None
+            item = self._items.popleft()
+            self.gets += 1
+            self._condition.notify_all()
+            return item
+
+    def __len__(self):
+        return len(self._items)
+
+    def get_stats(self):
+        """Depth, occupancy and drop/block counters"""
+        with self._condition:
+            puts = self.puts or 1
+            return {
+                'policy': self.policy,
+                'capacity': self.maxsize,
+                'depth': len(self._items),
+                'max_depth': self.max_depth,
+                'avg_occupancy': self.total_depth / puts / self.maxsize,
+                'puts': self.puts,
+                'gets': self.gets,
+                'dropped': self.dropped,
+                'blocked_ms': self.blocked_ms,
+            }
+
+
+def make_queue(name, settings=None):
+    """Queue named in DEFAULT_QUEUES, with per-lane overrides applied"""
+    options = dict(DEFAULT_QUEUES[name])
+    options.update((settings or {}).get(name, {}))
+    return BoundedQueue(name, **options)
+
+
+class StageStats:
+    """Throughput and service time of one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = time.time()
+        self.processed = 0
+        self.busy_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, started, finished=None):
+        """Account one item that took from started to finished"""
+        elapsed_ms = ((finished or time.time()) - started) * 1000.0
+        with self._lock:
+            self.processed += 1
+            self.busy_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def get_stats(self):
+        """Items/s, service time and the share of time the stage was busy"""
+        with self._lock:
+            uptime = max(time.time() - self.started_at, 1e-6)
+            processed = self.processed or 1
+            return {
+                'processed': self.processed,
+                'throughput_per_s': self.processed / uptime,
+                'avg_ms': self.busy_ms / processed,
+                'max_ms': self.max_ms,
+                'busy_ratio': min(self.busy_ms / 1000.0 / uptime, 1.0),
+            }
+
+
+class Stage:
+    """Worker thread applying fn to every item of its inbox until stopped"""
+
+    def __init__(self, name, inbox, fn):
+        self.name = name
+        self.inbox = inbox
+        self.fn = fn
+        self.stats = StageStats(name)
+        self.running = False
+        self._thread = None
+
+    def start(self):
+        self.running = True
+        self.stats = StageStats(self.name)
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f"Stage-{self.name}")
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Process what is still queued, then stop"""
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _run(self):
+        while self.running or len(self.inbox):
+            item = self.inbox.get(timeout=0.5)
+            if item is None:
+                continue
+            started = time.time()
+            try:
+                self.fn(item)
+            except Exception as e:
+                print(f"❌ Stage {self.name} error: {e}")
+            self.stats.record(started)
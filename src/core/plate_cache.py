@@ -0,0 +1,44 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class PlateDedupCache:
+    """TTL cache of recently logged plates for one camera.
+
+    Plates are kept in last-seen order, so expiry only ever looks at the
+    oldest entries and every lookup stays O(1) amortised.
+    """
+
+    def __init__(self, ttl_seconds=30.0):
+        self.ttl_seconds = ttl_seconds
+        self._last_seen = OrderedDict()
+        self._lock = threading.Lock()
+        self.duplicates = 0
+
+    def _expire(self, now):
+        while self._last_seen:
+            plate, seen_at = next(iter(self._last_seen.items()))
+            if now - seen_at <= self.ttl_seconds:
+                break
+            del self._last_seen[plate]
+
+    def seen_recently(self, plate_number, now=None):
+        """Return True for a repeat read, otherwise remember the plate.
+
+        A repeat read refreshes the timestamp, so a car standing in front
+        of the camera stays suppressed for as long as it keeps being read.
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            self._expire(now)
+            seen = plate_number in self._last_seen
+            self._last_seen[plate_number] = now
+            self._last_seen.move_to_end(plate_number)
+            if seen:
+                self.duplicates += 1
+            return seen
+
+    def __len__(self):
+        with self._lock:
+            return len(self._last_seen)
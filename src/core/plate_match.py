@@ -0,0 +1,113 @@
+import itertools
+import string
+import threading
+
+# Character pairs OCR mixes up on plates
+CONFUSABLE_PAIRS = {'0': 'O', 'O': '0', '1': 'I', 'I': '1', '8': 'B', 'B': '8'}
+TO_LETTER = str.maketrans({'0': 'O', '1': 'I', '8': 'B'})
+TO_DIGIT = str.maketrans({'O': '0', 'I': '1', 'B': '8'})
+LETTER_SLOT = set(string.ascii_uppercase) | {'0', '1', '8'}
+DIGIT_SLOT = set(string.digits) | {'O', 'I', 'B'}
+
+
+def normalize_plate(plate_number):
+    """Plate key as OCR produces it: no spaces, upper case"""
+    return plate_number.replace(" ", "").strip().upper()
+
+
+def canonical_plate(plate_number):
+    """Normalised plate with confusables folded only where the plate layout decides them.
+
+    Indonesian plates are region letters (1-2), a number (1-4 digits) and
+    suffix letters (0-3). A 0/1/8 in a letter block becomes O/I/B and an
+    O/I/B in the number block becomes 0/1/8; of the layouts a read fits,
+    the one needing the fewest folds wins. Reads that fit no layout are
+    returned unchanged.
+    """
+    plate = normalize_plate(plate_number)
+    best = None
+    for prefix_len in (1, 2):
+        for suffix_len in range(4):
+            number_len = len(plate) - prefix_len - suffix_len
+            if not 1 <= number_len <= 4:
+                continue
+            prefix = plate[:prefix_len]
+            number = plate[prefix_len:prefix_len + number_len]
+            suffix = plate[prefix_len + number_len:]
+            if not (set(prefix) <= LETTER_SLOT and set(number) <= DIGIT_SLOT and set(suffix) <= LETTER_SLOT):
+                continue
+            folded = prefix.translate(TO_LETTER) + number.translate(TO_DIGIT) + suffix.translate(TO_LETTER)
+            folds = sum(a != b for a, b in zip(plate, folded))
+            if best is None or folds < best[0]:
+                best = (folds, folded)
+    return best[1] if best else plate
+
+
+def confusable_variants(plate, swaps):
+    """Every plate reachable from plate by exactly `swaps` confusable substitutions"""
+    positions = [i for i, char in enumerate(plate) if char in CONFUSABLE_PAIRS]
+    for chosen in itertools.combinations(positions, swaps):
+        chars = list(plate)
+        for i in chosen:
+            chars[i] = CONFUSABLE_PAIRS[chars[i]]
+        yield "".join(chars)
+
+
+class PlateMatchIndex:
+    """Approximate plate lookup for OCR reads.
+
+    Reads and stored plates are compared by canonical_plate, which only
+    resolves confusables the plate layout leaves no doubt about. Beyond
+    that each 0/O, 1/I or 8/B swap counts as one edit, up to max_distance;
+    any other difference (T vs L, 4 vs 5, a missing character) never
+    matches, so one vehicle is not mistaken for another.
+    """
+
+    def __init__(self, max_distance=1):
+        self.max_distance = max_distance
+        self._plates = {}
+        self._lock = threading.Lock()
+
+    def rebuild(self, plates):
+        """Replace the whole index with the given plates"""
+        by_canonical = {}
+        for plate in plates:
+            by_canonical.setdefault(canonical_plate(plate), set()).add(plate)
+        with self._lock:
+            self._plates = by_canonical
+
+    def add(self, plate_number):
+        key = canonical_plate(plate_number)
+        with self._lock:
+            self._plates.setdefault(key, set()).add(plate_number)
+
+    def remove(self, plate_number):
+        key = canonical_plate(plate_number)
+        with self._lock:
+            plates = self._plates.get(key)
+            if not plates:
+                return
+            plates.discard(plate_number)
+            if not plates:
+                del self._plates[key]
+
+    def best_match(self, plate_number):
+        """Stored plate the read refers to within max_distance swaps, or None if none or ambiguous"""
+        read = normalize_plate(plate_number)
+        with self._lock:
+            exact = self._plates.get(canonical_plate(read))
+            if exact:
+                return read if read in exact else sorted(exact)[0]
+
+            for swaps in range(1, self.max_distance + 1):
+                found = {canonical_plate(variant) for variant in confusable_variants(read, swaps)}
+                found = [key for key in found if key in self._plates]
+                if len(found) > 1:
+                    # Two equally close plates: refuse to guess
+                    return None
+                if found:
+                    return sorted(self._plates[found[0]])[0]
+            return None
+
+    def __len__(self):
+        return len(self._plates)
@@ -0,0 +1,74 @@
+import cv2
+
+# Common height plate crops are resized to for one batched recogniser pass
+BATCH_CROP_HEIGHT = 64
+
+
+def preprocess_plate(cropped_image):
+    """Threshold and boost contrast of a plate crop before OCR"""
+    gray = cv2.cvtColor(cropped_image, cv2.COLOR_BGR2GRAY)
+    _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return cv2.convertScaleAbs(thresh, alpha=1.2, beta=10)
+
+
+def combine_ocr_results(ocr_results, min_conf=0.2):
+    """Join EasyOCR segments into one plate string and its mean confidence"""
+    combined_texts = []
+    confidences = []
+    fallback_text = ""
+    fallback_conf = 0.0
+
+    for (_, text, prob) in ocr_results:
+        cleaned_text = text.replace(" ", "").strip().upper()
+        if prob >= min_conf:
+            combined_texts.append(cleaned_text)
+            confidences.append(prob)
+        fallback_text = cleaned_text
+        fallback_conf = prob
+
+    if combined_texts:
+        return "".join(combined_texts), sum(confidences) / len(confidences)
+    return fallback_text, fallback_conf
+
+
+def read_plate(reader, cropped_image, min_conf=0.2):
+    """OCR one plate crop, returning (text, confidence)"""
+    ocr_results = reader.readtext(preprocess_plate(cropped_image))
+    if not ocr_results:
+        return "", 0.0
+    return combine_ocr_results(ocr_results, min_conf)
+
+
+def prepare_plate_batch(cropped_images, height=BATCH_CROP_HEIGHT):
+    """Preprocess crops and resize/pad them to one common size"""
+    resized = []
+    for cropped_image in cropped_images:
+        enhanced = preprocess_plate(cropped_image)
+        scale = height / float(enhanced.shape[0])
+        width = max(1, int(round(enhanced.shape[1] * scale)))
+        resized.append(cv2.resize(enhanced, (width, height), interpolation=cv2.INTER_LINEAR))
+
+    # Pad on the right with the edge colour so every crop has the same width
+    max_width = max(image.shape[1] for image in resized)
+    return [
+        cv2.copyMakeBorder(image, 0, 0, 0, max_width - image.shape[1], cv2.BORDER_REPLICATE)
+        for image in resized
+    ]
+
+
+def read_plates_batched(reader, cropped_images, min_conf=0.2):
+    """OCR several plate crops in one batched call, returning (text, confidence) per crop"""
+    if not cropped_images:
+        return []
+
+    batch = prepare_plate_batch(cropped_images)
+    height, width = batch[0].shape[:2]
+    batch_results = reader.readtext_batched(batch, n_width=width, n_height=height)
+
+    reads = []
+    for ocr_results in batch_results:
+        if ocr_results:
+            reads.append(combine_ocr_results(ocr_results, min_conf))
+        else:
+            reads.append(("", 0.0))
+    return reads
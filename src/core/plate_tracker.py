@@ -0,0 +1,198 @@
+import cv2
+import time
+from collections import defaultdict
+
+
+def box_iou(box_a, box_b):
+    """Intersection over union of two (x1, y1, x2, y2) boxes"""
+    ix1, iy1 = max(box_a[0], box_b[0]), max(box_a[1], box_b[1])
+    ix2, iy2 = min(box_a[2], box_b[2]), min(box_a[3], box_b[3])
+    inter = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    area_a = (box_a[2] - box_a[0]) * (box_a[3] - box_a[1])
+    area_b = (box_b[2] - box_b[0]) * (box_b[3] - box_b[1])
+    union = area_a + area_b - inter
+    return inter / union if union > 0 else 0.0
+
+
+def box_centroid_distance(box_a, box_b):
+    """Centroid distance of two boxes, relative to the size of the first"""
+    ax, ay = (box_a[0] + box_a[2]) / 2.0, (box_a[1] + box_a[3]) / 2.0
+    bx, by = (box_b[0] + box_b[2]) / 2.0, (box_b[1] + box_b[3]) / 2.0
+    size = max(box_a[2] - box_a[0], box_a[3] - box_a[1], 1)
+    return ((ax - bx) ** 2 + (ay - by) ** 2) ** 0.5 / size
+
+
+def crop_quality(cropped_image):
+    """Sharpness (variance of the Laplacian) weighted by crop area"""
+    gray = cv2.cvtColor(cropped_image, cv2.COLOR_BGR2GRAY)
+    sharpness = cv2.Laplacian(gray, cv2.CV_64F).var()
+    return sharpness * gray.shape[0] * gray.shape[1]
+
+
+def fuse_plate_reads(reads):
+    """Combine several (text, confidence) reads of one plate by per-character voting.
+
+    Reads are first grouped by length and the length with the most total
+    confidence wins; every position is then voted on by confidence.
+    Returns (text, confidence).
+    """
+    reads = [(text, conf) for text, conf in reads if text]
+    if not reads:
+        return "", 0.0
+
+    length_votes = defaultdict(float)
+    for text, conf in reads:
+        length_votes[len(text)] += conf
+    plate_length = max(length_votes, key=length_votes.get)
+    same_length = [(text, conf) for text, conf in reads if len(text) == plate_length]
+
+    characters = []
+    agreement = []
+    for position in range(plate_length):
+        votes = defaultdict(float)
+        for text, conf in same_length:
+            votes[text[position]] += conf
+        winner = max(votes, key=votes.get)
+        characters.append(winner)
+        agreement.append(votes[winner] / sum(votes.values()))
+
+    mean_conf = sum(conf for _, conf in same_length) / len(same_length)
+    return "".join(characters), mean_conf * sum(agreement) / plate_length
+
+
+class PlateTrack:
+    """One plate followed across frames, with its OCR reads and best crop"""
+
+    def __init__(self, track_id, box, now):
+        self.track_id = track_id
+        self.box = box
+        self.first_seen = now
+        self.last_seen = now
+        self.hits = 1
+        self.reads = []
+        self.ocr_attempts = 0
+        self.best_crop = None
+        self.best_quality = 0.0
+        self.pending_ocr = 0
+        self.ocr_latency = 0.0
+        self.finished = False
+
+    def add_read(self, text, confidence):
+        """Record one OCR read of this track"""
+        if text:
+            self.reads.append((text, confidence))
+
+    def fused_text(self):
+        """Best plate text for this track so far, as (text, confidence)"""
+        return fuse_plate_reads(self.reads)
+
+
+class PlateTracker:
+    """IoU/centroid tracker over YOLO plate boxes.
+
+    update() hands back the crops worth OCR-ing (a track's first crop and
+    later crops that are clearly sharper or larger, up to a per-track
+    budget) and the tracks that ended, each of which is committed once.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_centroid_distance=0.75, max_age_seconds=1.0,
+                 max_ocr_per_track=3, min_quality_gain=1.2, min_hits=2):
+        self.iou_threshold = iou_threshold
+        self.max_centroid_distance = max_centroid_distance
+        self.max_age_seconds = max_age_seconds
+        self.max_ocr_per_track = max_ocr_per_track
+        self.min_quality_gain = min_quality_gain
+        self.min_hits = min_hits
+        self.tracks = {}
+        self._next_id = 1
+
+    def _match(self, boxes):
+        pairs = []
+        for track_id, track in self.tracks.items():
+            for index, box in enumerate(boxes):
+                iou = box_iou(track.box, box)
+                if iou >= self.iou_threshold:
+                    pairs.append((1.0 + iou, track_id, index))
+                else:
+                    distance = box_centroid_distance(track.box, box)
+                    if distance <= self.max_centroid_distance:
+                        pairs.append((1.0 - distance / self.max_centroid_distance, track_id, index))
+
+        # Greedy assignment, best IoU first, centroid matches after
+        matches = {}
+        used_boxes = set()
+        for _, track_id, index in sorted(pairs, reverse=True):
+            if track_id in matches or index in used_boxes:
+                continue
+            matches[track_id] = index
+            used_boxes.add(index)
+        return matches, used_boxes
+
+    def update(self, boxes, frame, now=None):
+        """Feed one frame's boxes, returning (ocr_requests, finished_tracks).
+
+        ocr_requests is a list of (track, crop) pairs; finished_tracks are
+        tracks that disappeared and should be committed.
+        """
+        now = now if now is not None else time.time()
+        boxes = [tuple(map(int, box)) for box in boxes]
+        matches, used_boxes = self._match(boxes)
+
+        ocr_requests = []
+        for track_id, index in matches.items():
+            track = self.tracks[track_id]
+            track.box = boxes[index]
+            track.last_seen = now
+            track.hits += 1
+            self._consider_crop(track, frame, ocr_requests)
+
+        for index, box in enumerate(boxes):
+            if index in used_boxes:
+                continue
+            track = PlateTrack(self._next_id, box, now)
+            self._next_id += 1
+            self.tracks[track.track_id] = track
+            self._consider_crop(track, frame, ocr_requests)
+
+        finished = []
+        for track_id in list(self.tracks):
+            track = self.tracks[track_id]
+            if now - track.last_seen > self.max_age_seconds:
+                del self.tracks[track_id]
+                if track.hits >= self.min_hits:
+                    finished.append(track)
+        return ocr_requests, finished
+
+    def hold(self, now=None):
+        """Keep every open track alive through a frame that was not detected on.
+
+        Used while the motion gate is closed: nothing moved in the lane,
+        so each plate is still where it was last seen and must not age
+        out and be committed while the car is standing still.
+        """
+        now = now if now is not None else time.time()
+        for track in self.tracks.values():
+            track.last_seen = now
+
+    def _consider_crop(self, track, frame, ocr_requests):
+        x1, y1, x2, y2 = track.box
+        cropped_image = frame[max(0, y1):y2, max(0, x1):x2]
+        if cropped_image.size == 0:
+            return
+
+        quality = crop_quality(cropped_image)
+        if quality <= track.best_quality * self.min_quality_gain:
+            return
+
+        # Own the pixels so the track doesn't keep the whole frame alive
+        track.best_crop = cropped_image.copy()
+        track.best_quality = quality
+        if track.ocr_attempts < self.max_ocr_per_track:
+            track.ocr_attempts += 1
+            ocr_requests.append((track, track.best_crop))
+
+    def flush(self):
+        """End every open track, e.g. when detection stops"""
+        finished = [track for track in self.tracks.values() if track.hits >= self.min_hits]
+        self.tracks = {}
+        return finished
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+MJPEG_BOUNDARY = "frame"
+MJPEG_MEDIA_TYPE = f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}"
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class FrameBroadcaster:
+    """Latest JPEG preview frame of one camera, fanned out to every viewer.
+
+    publish() stores an already encoded frame once; each viewer's MJPEG
+    stream waits for a newer frame and always sends the newest one, so a
+    slow viewer skips frames instead of building a backlog.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.jpeg = None
+        self.seq = 0
+        self._lock = threading.Lock()
+        self._waiters = set()
+
+        # Stream statistics
+        self.viewers = 0
+        self.published = 0
+        self.sent = 0
+        self.dropped = 0
+
+    def publish(self, jpeg):
+        """Make an encoded frame the current one, from any thread"""
+        with self._lock:
+            self.jpeg = jpeg
+            self.seq += 1
+            self.published += 1
+            waiters, self._waiters = self._waiters, set()
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+    def clear(self):
+        """Forget the current frame, e.g. when the preview stops"""
+        with self._lock:
+            self.jpeg = None
+
+    async def next_frame(self, last_seq, timeout=5.0):
+        """Wait for a frame newer than last_seq, returns (seq, jpeg) or (last_seq, None) on timeout"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.seq > last_seq and self.jpeg is not None:
+                return self.seq, self.jpeg
+            future = loop.create_future()
+            waiter = (loop, future)
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._waiters.discard(waiter)
+            return last_seq, None
+        with self._lock:
+            return self.seq, self.jpeg
+
+    async def stream(self):
+        """multipart/x-mixed-replace body for one viewer"""
+        self.viewers += 1
+        last_seq = 0
+        try:
+            while True:
+                seq, jpeg = await self.next_frame(last_seq)
+                if jpeg is None:
+                    continue
+                if last_seq:
+                    self.dropped += seq - last_seq - 1
+                last_seq = seq
+                self.sent += 1
+                yield (f"--{MJPEG_BOUNDARY}\r\n"
+                       f"Content-Type: image/jpeg\r\n"
+                       f"Content-Length: {len(jpeg)}\r\n\r\n").encode() + jpeg + b"\r\n"
+        finally:
+            self.viewers -= 1
+
+    def get_stats(self):
+        """Viewers and frames published, sent and skipped for slow viewers"""
+        return {
+            'viewers': self.viewers,
+            'published': self.published,
+            'sent': self.sent,
+            'dropped': self.dropped,
+        }
@@ -0,0 +1,227 @@
+import os
+import threading
+import time
+from collections import deque
+
+base_dir = os.path.abspath(os.path.dirname(__file__))
+project_dir = os.path.dirname(os.path.dirname(base_dir))
+IMAGE_ROOT = os.path.join(project_dir, "Captured Image")
+LOG_ROOT = os.path.join(project_dir, "HasilDeteksi")
+
+GB = 1024 ** 3
+
+# Budget of one lane's evidence directory unless the lane sets its own
+LANE_BUDGET = {'max_age_days': 90, 'max_bytes': 20 * GB}
+
+# Age and size budget per directory; nested budget roots are managed on their own
+DEFAULT_BUDGETS = {
+    os.path.join(IMAGE_ROOT, "Entry"): {'max_age_days': 90, 'max_bytes': 20 * GB},
+    os.path.join(IMAGE_ROOT, "Exit"): {'max_age_days': 90, 'max_bytes': 20 * GB},
+    IMAGE_ROOT: {'max_age_days': 90, 'max_bytes': 5 * GB},
+    LOG_ROOT: {'max_age_days': 365, 'max_bytes': 1 * GB},
+}
+
+
+def budgets_for_lanes(lanes):
+    """DEFAULT_BUDGETS with one budget per lane image_dir, so each camera is limited on its own"""
+    budgets = {root: limits for root, limits in DEFAULT_BUDGETS.items()
+               if root in (IMAGE_ROOT, LOG_ROOT)}
+    for lane in lanes:
+        limits = dict(LANE_BUDGET)
+        limits.update(lane.retention)
+        budgets[lane.image_dir] = limits
+    return budgets
+
+
+class DirectoryBudget:
+    """Oldest-first index of the files under one budget root"""
+
+    def __init__(self, root, max_age_days, max_bytes):
+        self.root = root
+        self.max_age_seconds = max_age_days * 86400
+        self.max_bytes = max_bytes
+        # (mtime, path) oldest first; sizes holds the current size of each indexed path
+        self.files = deque()
+        self.sizes = {}
+        self.total_bytes = 0
+        self.evicted_files = 0
+        self.evicted_bytes = 0
+
+    def scan(self, skip_roots):
+        """Build the index with one walk of the directory tree"""
+        entries = []
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.path not in skip_roots:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime, entry.path, stat.st_size))
+            except FileNotFoundError:
+                continue
+        entries.sort()
+        self.files = deque((mtime, path) for mtime, path, _ in entries)
+        self.sizes = {path: size for _, path, size in entries}
+        self.total_bytes = sum(self.sizes.values())
+
+    def track(self, path, size, mtime):
+        previous = self.sizes.get(path)
+        if previous is not None:
+            # Already indexed (e.g. the event log file open during the scan): only its size changed
+            self.total_bytes += size - previous
+            self.sizes[path] = size
+            return
+        self.files.append((mtime, path))
+        self.sizes[path] = size
+        self.total_bytes += size
+
+    def evict(self, now, max_files):
+        """Delete the oldest files while over the age or size budget"""
+        evicted = 0
+        touched_dirs = set()
+        while self.files and evicted < max_files:
+            mtime, path = self.files[0]
+            if now - mtime <= self.max_age_seconds and self.total_bytes <= self.max_bytes:
+                break
+            self.files.popleft()
+            size = self.sizes.pop(path)
+            self.total_bytes -= size
+            try:
+                os.remove(path)
+                self.evicted_files += 1
+                self.evicted_bytes += size
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"⚠️ Retention could not delete {path}: {e}")
+            touched_dirs.add(os.path.dirname(path))
+            evicted += 1
+
+        # Drop day shards that became empty
+        for directory in touched_dirs:
+            if directory != self.root:
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    pass
+        return evicted
+
+
+class RetentionManager:
+    """Keeps image and log directories within per-camera age/size budgets.
+
+    Directories are walked once at start; afterwards new files are
+    registered through track() (the evidence writer and event log do
+    this), so the background pass never rescans the tree. Each pass
+    evicts at most max_evictions_per_pass files.
+    """
+
+    def __init__(self, budgets=None, interval=30.0, max_evictions_per_pass=500):
+        budgets = budgets or DEFAULT_BUDGETS
+        self.budgets = {
+            os.path.abspath(root): DirectoryBudget(os.path.abspath(root), **limits)
+            for root, limits in budgets.items()
+        }
+        self.interval = interval
+        self.max_evictions_per_pass = max_evictions_per_pass
+        self.running = False
+        self.scanned = False
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _budget_for(self, path):
+        # Longest matching root wins, so a lane's directory is not counted under its parent
+        path = os.path.abspath(path)
+        best = None
+        for root, budget in self.budgets.items():
+            if path.startswith(root + os.sep) and (best is None or len(root) > len(best.root)):
+                best = budget
+        return best
+
+    def scan(self):
+        """Index every budget directory once"""
+        roots = set(self.budgets)
+        with self._lock:
+            for root, budget in self.budgets.items():
+                budget.scan(roots - {root})
+            self.scanned = True
+        print("✅ Retention index built: " + ", ".join(
+            f"{os.path.basename(root) or root} {len(budget.files)} files" for root, budget in self.budgets.items()))
+
+    def track(self, path, size=None, mtime=None):
+        """Register a newly written file"""
+        budget = self._budget_for(path)
+        # Files written before the initial scan finishes are picked up by the scan
+        if budget is None or not self.scanned:
+            return
+        if size is None:
+            size = os.path.getsize(path)
+        with self._lock:
+            budget.track(path, size, mtime or time.time())
+
+    def run_once(self):
+        """One incremental pass: evict over-budget files"""
+        now = time.time()
+        evicted = 0
+        with self._lock:
+            for budget in self.budgets.values():
+                evicted += budget.evict(now, self.max_evictions_per_pass - evicted)
+                if evicted >= self.max_evictions_per_pass:
+                    break
+        return evicted
+
+    def start(self):
+        """Build the index and start the background retention thread"""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="Retention")
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+
+    def _run(self):
+        self.scan()
+        while self.running:
+            try:
+                evicted = self.run_once()
+                if evicted:
+                    print(f"🧹 Retention evicted {evicted} files")
+            except Exception as e:
+                print(f"Retention error: {e}")
+            time.sleep(self.interval)
+
+    def get_stats(self):
+        """Indexed size and eviction counts per budget directory"""
+        with self._lock:
+            return {
+                root: {
+                    'files': len(budget.files),
+                    'bytes': budget.total_bytes,
+                    'max_bytes': budget.max_bytes,
+                    'evicted_files': budget.evicted_files,
+                    'evicted_bytes': budget.evicted_bytes,
+                }
+                for root, budget in self.budgets.items()
+            }
+
+
+# Process-wide manager, started by the app server
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_retention_manager(budgets=None):
+    """Return the shared retention manager, starting it on first use with budgets"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = RetentionManager(budgets)
+            _manager.start()
+        return _manager
@@ -0,0 +1,287 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from datetime import date, datetime
+from src.core.db_pool import get_db_pool
+
+# ===== TABLE DEFINITIONS =====
+CREATE_SCHEMA_VERSION = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INT NOT NULL PRIMARY KEY,
+        description VARCHAR(255) NOT NULL,
+        applied_at DATETIME NOT NULL
+    ) ENGINE=InnoDB
+"""
+
+CREATE_MEMBER_LIST = """
+    CREATE TABLE IF NOT EXISTS member_list (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        plate_number VARCHAR(20) NOT NULL,
+        owner_name VARCHAR(100),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE KEY uq_member_plate (plate_number)
+    ) ENGINE=InnoDB
+"""
+
+# The partition key must be part of every unique key, hence PRIMARY KEY (id, timestamp)
+CREATE_ACCESS_LOG = """
+    CREATE TABLE IF NOT EXISTS access_log (
+        id BIGINT AUTO_INCREMENT,
+        plate_number VARCHAR(20) NOT NULL,
+        status VARCHAR(10) NOT NULL,
+        event_type VARCHAR(10),
+        camera_location VARCHAR(50),
+        timestamp DATETIME NOT NULL,
+        PRIMARY KEY (id, timestamp),
+        KEY idx_access_log_timestamp (timestamp),
+        KEY idx_access_log_plate_time (plate_number, timestamp)
+    ) ENGINE=InnoDB
+    PARTITION BY RANGE (TO_DAYS(timestamp)) (
+        PARTITION p_future VALUES LESS THAN MAXVALUE
+    )
+"""
+
+CREATE_VEHICLE_SESSIONS = """
+    CREATE TABLE IF NOT EXISTS vehicle_sessions (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        plate_number VARCHAR(20) NOT NULL,
+        entry_time DATETIME,
+        exit_time DATETIME,
+        duration_minutes INT,
+        member_status VARCHAR(10),
+        status VARCHAR(12) NOT NULL DEFAULT 'active',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME,
+        KEY idx_sessions_plate_status_entry (plate_number, status, entry_time),
+        KEY idx_sessions_status_entry (status, entry_time)
+    ) ENGINE=InnoDB
+"""
+
+# Indexes behind the queries the app runs, also added to tables created by hand
+HOT_PATH_INDEXES = [
+    ('member_list', 'uq_member_plate', 'UNIQUE', '(plate_number)'),
+    ('access_log', 'idx_access_log_timestamp', '', '(timestamp)'),
+    ('access_log', 'idx_access_log_plate_time', '', '(plate_number, timestamp)'),
+    ('vehicle_sessions', 'idx_sessions_plate_status_entry', '', '(plate_number, status, entry_time)'),
+    ('vehicle_sessions', 'idx_sessions_status_entry', '', '(status, entry_time)'),
+]
+
+# Queries the app runs on its hot paths, checked by explain_self_check()
+HOT_PATH_QUERIES = [
+    ("recent logs", "SELECT plate_number, status, timestamp FROM access_log ORDER BY timestamp DESC LIMIT 20", ()),
+    ("member lookup", "SELECT plate_number FROM member_list WHERE plate_number = %s", ('B1234XY',)),
+    ("active session lookup", """
+        SELECT id, entry_time FROM vehicle_sessions
+        WHERE plate_number = %s AND status = 'active'
+        ORDER BY entry_time DESC LIMIT 1
+    """, ('B1234XY',)),
+    ("active session load", """
+        SELECT id, plate_number, entry_time, member_status FROM vehicle_sessions
+        WHERE status = 'active'
+        ORDER BY entry_time
+    """, ()),
+]
+
+
+# ===== HELPERS =====
+def _index_exists(cursor, table, index_name):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+    """, (table, index_name))
+    return cursor.fetchone() is not None
+
+
+def _is_partitioned(cursor, table):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.partitions
+        WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL
+    """, (table,))
+    return cursor.fetchone()[0] > 0
+
+
+def _add_months(day, months):
+    month_index = day.year * 12 + (day.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def ensure_access_log_partitions(cursor, months_ahead=3):
+    """Split the catch-all partition so every month up to months_ahead has its own"""
+    if not _is_partitioned(cursor, 'access_log'):
+        return []
+
+    cursor.execute("""
+        SELECT partition_name FROM information_schema.partitions
+        WHERE table_schema = DATABASE() AND table_name = 'access_log'
+    """)
+    existing = {row[0] for row in cursor.fetchall()}
+
+    this_month = date.today().replace(day=1)
+    added = []
+    for offset in range(months_ahead + 1):
+        month = _add_months(this_month, offset)
+        name = f"p{month:%Y%m}"
+        if name in existing:
+            continue
+        upper = _add_months(month, 1)
+        cursor.execute(f"""
+            ALTER TABLE access_log REORGANIZE PARTITION p_future INTO (
+                PARTITION {name} VALUES LESS THAN (TO_DAYS('{upper:%Y-%m-%d}')),
+                PARTITION p_future VALUES LESS THAN MAXVALUE
+            )
+        """)
+        added.append(name)
+    if added:
+        print(f"✅ access_log partitions added: {', '.join(added)}")
+    return added
+
+
+# ===== MIGRATIONS =====
+def _migration_create_tables(cursor):
+    cursor.execute(CREATE_MEMBER_LIST)
+    cursor.execute(CREATE_ACCESS_LOG)
+    cursor.execute(CREATE_VEHICLE_SESSIONS)
+
+
+def _migration_hot_path_indexes(cursor):
+    for table, index_name, kind, columns in HOT_PATH_INDEXES:
+        if not _index_exists(cursor, table, index_name):
+            cursor.execute(f"CREATE {kind} INDEX {index_name} ON {table} {columns}")
+            print(f"✅ Index {index_name} created on {table}")
+
+
+MIGRATIONS = [
+    (1, "create member_list, access_log and vehicle_sessions", _migration_create_tables),
+    (2, "hot-path indexes", _migration_hot_path_indexes),
+]
+
+
+def _column_type(cursor, table, column):
+    cursor.execute("""
+        SELECT DATA_TYPE FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    """, (table, column))
+    row = cursor.fetchone()
+    return row[0].lower() if row else None
+
+
+def _primary_key_columns(cursor, table):
+    cursor.execute("""
+        SELECT column_name FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = 'PRIMARY'
+        ORDER BY seq_in_index
+    """, (table,))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def partition_access_log(cursor):
+    """Convert an existing unpartitioned access_log to monthly range partitioning.
+
+    Rebuilds the whole table with writes blocked, so it is an explicit
+    CLI step and never runs at startup. Tables created by this module are
+    partitioned from the start.
+    """
+    if _is_partitioned(cursor, 'access_log'):
+        print("access_log is already partitioned")
+        return False
+
+    # TO_DAYS() partitioning is rejected on TIMESTAMP columns
+    column_type = _column_type(cursor, 'access_log', 'timestamp')
+    if column_type not in ('datetime', 'date'):
+        print(f"❌ access_log.timestamp is {column_type}, not DATETIME. Convert it first with "
+              f"ALTER TABLE access_log MODIFY timestamp DATETIME NOT NULL, "
+              f"after checking the server time zone")
+        return False
+
+    cursor.execute("""
+        SELECT table_rows FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND table_name = 'access_log'
+    """)
+    row = cursor.fetchone()
+    print(f"🔧 Rebuilding access_log (~{row[0] if row else 0} rows) with monthly partitions, "
+          f"writes are blocked until it finishes")
+
+    # The partition key must be part of every unique key; one ALTER, so one rebuild
+    key_change = ""
+    if _primary_key_columns(cursor, 'access_log') != ['id', 'timestamp']:
+        key_change = "DROP PRIMARY KEY, ADD PRIMARY KEY (id, timestamp)"
+    cursor.execute(f"""
+        ALTER TABLE access_log {key_change}
+        PARTITION BY RANGE (TO_DAYS(timestamp)) (
+            PARTITION p_future VALUES LESS THAN MAXVALUE
+        )
+    """)
+    print("✅ access_log converted to monthly range partitioning")
+    ensure_access_log_partitions(cursor)
+    return True
+
+
+def get_schema_version(cursor):
+    cursor.execute(CREATE_SCHEMA_VERSION)
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cursor.fetchone()[0]
+
+
+def migrate(months_ahead=3):
+    """Apply pending migrations in order and make sure upcoming partitions exist"""
+    with get_db_pool().connection() as conn:
+        cursor = conn.cursor()
+        current = get_schema_version(cursor)
+        for version, description, apply in MIGRATIONS:
+            if version <= current:
+                continue
+            print(f"🔧 Applying schema migration {version}: {description}")
+            # DDL commits implicitly in MySQL, so each step records itself right after
+            apply(cursor)
+            cursor.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (%s, %s, %s)",
+                (version, description, datetime.now())
+            )
+            conn.commit()
+            current = version
+
+        ensure_access_log_partitions(cursor, months_ahead)
+        conn.commit()
+        cursor.close()
+    return current
+
+
+def explain_self_check():
+    """EXPLAIN every hot-path query and return the ones doing full table scans"""
+    problems = []
+    with get_db_pool().connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        for name, query, params in HOT_PATH_QUERIES:
+            cursor.execute(f"EXPLAIN {query}", params)
+            for row in cursor.fetchall():
+                access_type = row.get('type')
+                if access_type == 'ALL':
+                    problems.append({
+                        'query': name,
+                        'table': row.get('table'),
+                        'rows': row.get('rows'),
+                        'extra': row.get('Extra'),
+                    })
+                    print(f"⚠️ [SCHEMA CHECK] '{name}' does a full table scan on {row.get('table')} "
+                          f"(~{row.get('rows')} rows)")
+        cursor.close()
+    if not problems:
+        print("✅ [SCHEMA CHECK] No full table scans in hot-path queries")
+    return problems
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "migrate"
+    if command == "migrate":
+        print(f"Schema version: {migrate()}")
+    elif command == "check":
+        explain_self_check()
+    elif command == "partition":
+        with get_db_pool().connection() as conn:
+            cursor = conn.cursor()
+            partition_access_log(cursor)
+            conn.commit()
+            cursor.close()
+    else:
+        print("Usage: python src/core/schema.py [migrate|check|partition]")
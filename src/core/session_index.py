@@ -0,0 +1,134 @@
+import threading
+from src.core.db_pool import get_db_pool
+from src.core.member_cache import normalize_plate
+from src.core.plate_match import PlateMatchIndex
+
+
+class ActiveSession:
+    """An open vehicle_sessions row"""
+
+    def __init__(self, session_id, plate_number, entry_time, member_status):
+        self.session_id = session_id
+        self.plate_number = plate_number
+        self.entry_time = entry_time
+        self.member_status = member_status
+
+
+class StagedSessions:
+    """Session changes made inside one DB transaction.
+
+    Lookups see earlier changes of the same batch; the index itself is only
+    touched by commit(), after the database transaction went through.
+    """
+
+    _REMOVED = object()
+
+    def __init__(self, index):
+        self.index = index
+        self.changes = {}
+
+    def get(self, plate_number):
+        key = normalize_plate(plate_number)
+        if key in self.changes:
+            session = self.changes[key]
+            return None if session is self._REMOVED else session
+        return self.index.get(key)
+
+    def find(self, plate_number):
+        """Session for a read, falling back to an active plate one confusable swap away"""
+        session = self.get(plate_number)
+        if session is not None:
+            return session
+        key = self.index.match_key(plate_number)
+        return self.get(key) if key else None
+
+    def put(self, session):
+        self.changes[normalize_plate(session.plate_number)] = session
+
+    def remove(self, plate_number):
+        self.changes[normalize_plate(plate_number)] = self._REMOVED
+
+    def commit(self):
+        self.index.apply(self.changes, self._REMOVED)
+        self.changes = {}
+
+
+class ActiveSessionIndex:
+    """In-memory plate -> active session map, so entry/exit need no session SELECT.
+
+    Rebuilt from vehicle_sessions on startup and afterwards kept in step by
+    the DB writer, which is the only place sessions are opened or closed.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._matcher = PlateMatchIndex(max_distance=1)
+
+    def load(self):
+        """Rebuild the index from the active rows in vehicle_sessions"""
+        with get_db_pool().connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, plate_number, entry_time, member_status FROM vehicle_sessions
+                WHERE status = 'active'
+                ORDER BY entry_time
+            """)
+            sessions = {}
+            # Later rows win, matching the old ORDER BY entry_time DESC LIMIT 1 lookup
+            for session_id, plate_number, entry_time, member_status in cursor.fetchall():
+                sessions[normalize_plate(plate_number)] = ActiveSession(
+                    session_id, plate_number, entry_time, member_status)
+            cursor.close()
+
+        self._matcher.rebuild(sessions)
+        with self._lock:
+            self._sessions = sessions
+            self.loaded = True
+        print(f"✅ Active session index loaded: {len(sessions)} open sessions")
+
+    def get(self, plate_number):
+        return self._sessions.get(normalize_plate(plate_number))
+
+    def match_key(self, plate_number):
+        """Active plate key closest to an OCR read, or None"""
+        return self._matcher.best_match(normalize_plate(plate_number))
+
+    def begin(self):
+        """Start staging changes for one DB transaction"""
+        return StagedSessions(self)
+
+    def apply(self, changes, removed_marker):
+        with self._lock:
+            for key, session in changes.items():
+                if session is removed_marker:
+                    self._sessions.pop(key, None)
+                    self._matcher.remove(key)
+                else:
+                    self._sessions[key] = session
+                    self._matcher.add(key)
+
+    def plates(self):
+        """Plates with an open session"""
+        with self._lock:
+            return list(self._sessions)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+# Process-wide index shared by the DB writer and the app
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_session_index():
+    """Return the shared active-session index, loading it on first use"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            index = ActiveSessionIndex()
+            index.load()
+            _index = index
+        return _index
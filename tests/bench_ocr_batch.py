@@ -0,0 +1,61 @@
+import cv2
+import numpy as np
+import glob
+import os
+import sys
+import time
+
+# 📂 Run from the project root or from tests/
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_dir)
+
+from src.core.model_registry import get_ocr_reader
+from src.core.plate_ocr import read_plate, read_plates_batched
+
+BATCH_SIZE = 4
+ROUNDS = 10
+
+
+# 🖼️ Use saved plate crops when available, otherwise render synthetic plates
+def load_crops():
+    # Evidence is saved as JPEG by default, older captures as PNG
+    paths = sorted(
+        path
+        for pattern in ("*.jpg", "*.webp", "*.png")
+        for path in glob.glob(os.path.join(project_dir, "Captured Image", "**", pattern), recursive=True)
+    )
+    crops = [cv2.imread(path) for path in paths[:BATCH_SIZE * ROUNDS]]
+    crops = [crop for crop in crops if crop is not None]
+    if crops:
+        print(f"Using {len(crops)} saved plate crops")
+        return crops
+
+    print("No saved crops found, using synthetic plates")
+    crops = []
+    for i in range(BATCH_SIZE * ROUNDS):
+        crop = np.full((60 + (i % 3) * 10, 220, 3), 255, dtype=np.uint8)
+        cv2.putText(crop, f"B {1000 + i} XY", (10, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 3)
+        crops.append(crop)
+    return crops
+
+
+reader = get_ocr_reader()
+crops = load_crops()
+batches = [crops[i:i + BATCH_SIZE] for i in range(0, len(crops), BATCH_SIZE)]
+
+# 🐢 One readtext call per crop
+start = time.perf_counter()
+for batch in batches:
+    for crop in batch:
+        read_plate(reader, crop)
+per_crop_time = time.perf_counter() - start
+
+# 🚀 One readtext_batched call per group of crops
+start = time.perf_counter()
+for batch in batches:
+    read_plates_batched(reader, batch)
+batched_time = time.perf_counter() - start
+
+print(f"Per-crop : {len(crops) / per_crop_time:.1f} crops/sec")
+print(f"Batched  : {len(crops) / batched_time:.1f} crops/sec (batch size {BATCH_SIZE})")
+print(f"Speedup  : {per_crop_time / batched_time:.2f}x")
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 📂 Tests import the app's modules as src.core.*, like the benchmarks do
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_dir not in sys.path:
+    sys.path.insert(0, project_dir)
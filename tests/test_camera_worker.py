@@ -0,0 +1,62 @@
+import multiprocessing as mp
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+from src.core.camera_worker import CameraProcess
+from src.core.lane_registry import LaneConfig
+
+
+def _child():
+    time.sleep(0.1)
+
+
+class StubPipeline:
+    """Stands in for LanePipeline inside the worker: no camera, no models"""
+
+    def __init__(self, lane, headless=False):
+        self.camera_type = lane.label
+        self.grabber = None
+        self.db_writer = None
+        self.event_log = None
+        self.should_stop = False
+
+    def detect_from_camera(self):
+        # Like the worker's OCR pool: a worker must be allowed to start processes
+        child = mp.get_context("spawn").Process(target=_child)
+        child.start()
+        child.join()
+        while not self.should_stop:
+            time.sleep(0.05)
+
+    def annotate(self, frame, max_age=1.0):
+        return frame
+
+    def get_stats(self):
+        return {'stub': True}
+
+
+def wait_for(condition, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def test_worker_starts_and_stops():
+    worker = CameraProcess(LaneConfig("entry", 0), ocr_workers=0, stats_interval=0.2,
+                           pipeline_factory=StubPipeline)
+    worker.start()
+    try:
+        assert wait_for(lambda: worker.starts >= 1)
+        assert wait_for(lambda: worker.stats.get('stub'))
+        assert worker.is_alive()
+        assert worker.restarts == 0
+    finally:
+        worker.stop()
+    assert not worker.is_alive()
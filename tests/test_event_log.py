@@ -0,0 +1,41 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+from src.core.event_log import EventLog, iter_events
+
+
+def write_events(log_dir, day, timestamps):
+    path = os.path.join(log_dir, f"events_{day}_001.jsonl")
+    with open(path, "a", encoding="utf-8") as f:
+        for timestamp in timestamps:
+            f.write(json.dumps({'timestamp': timestamp, 'camera': "ENTRY", 'plate': "B1234SD"}) + "\n")
+
+
+def test_whole_day_includes_its_last_second(tmp_path):
+    log_dir = str(tmp_path)
+    write_events(log_dir, "2026-03-01", ["2026-03-01T00:00:00.000", "2026-03-01T23:59:59.500"])
+    write_events(log_dir, "2026-03-02", ["2026-03-02T00:00:00.000"])
+    day = datetime(2026, 3, 1)
+    events = list(iter_events(log_dir, start=day, end=day + timedelta(days=1)))
+    assert [event['timestamp'] for event in events] == [
+        "2026-03-01T00:00:00.000", "2026-03-01T23:59:59.500"]
+
+
+def test_filters_camera_and_plate(tmp_path):
+    log_dir = str(tmp_path)
+    write_events(log_dir, "2026-03-01", ["2026-03-01T10:00:00.000"])
+    assert len(list(iter_events(log_dir, camera="entry", plate="b 1234 sd"))) == 1
+    assert not list(iter_events(log_dir, camera="exit"))
+
+
+def test_recorded_events_are_flushed_and_read_back(tmp_path):
+    log = EventLog(log_dir=str(tmp_path), flush_interval=0.05)
+    log.start()
+    now = datetime(2026, 3, 1, 12).timestamp()
+    log.record("EXIT", "B1234SD", confidence=0.9, box=(1, 2, 3, 4), timestamp=now)
+    log.stop()
+    events = list(iter_events(str(tmp_path)))
+    assert len(events) == 1
+    assert events[0]['camera'] == "EXIT"
+    assert events[0]['box'] == [1, 2, 3, 4]
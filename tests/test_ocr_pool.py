@@ -0,0 +1,99 @@
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.core.ocr_pool import OCRJob, OCRProcessPool, TrackOCRDispatcher
+from src.core.pipeline_stages import DROP_NEWEST, make_queue
+
+
+class RecordingPool:
+    """Stands in for OCRProcessPool: keeps the callbacks, runs no OCR"""
+
+    def __init__(self):
+        self.callbacks = {}
+
+    def register_camera(self, camera, callback):
+        self.callbacks[camera] = callback
+
+    def unregister_camera(self, camera, callback=None):
+        if callback is None or self.callbacks.get(camera) == callback:
+            self.callbacks.pop(camera, None)
+
+
+def test_dispatcher_keeps_configured_commit_queue():
+    # Empty, so falsy: must still be used instead of the default
+    tracks = make_queue('tracks', {'tracks': {'maxsize': 7, 'policy': DROP_NEWEST}})
+    dispatcher = TrackOCRDispatcher("ENTRY", RecordingPool(), lambda track: None, tracks)
+    assert dispatcher.commit_queue is tracks
+    stats = dispatcher.commit_queue.get_stats()
+    assert (stats['capacity'], stats['policy']) == (7, DROP_NEWEST)
+
+
+def test_closing_dispatcher_keeps_its_replacement_registered():
+    pool = RecordingPool()
+    old = TrackOCRDispatcher("ENTRY", pool, lambda track: None)
+    old.start()
+    # Stop then Start quickly: the new pipeline registers before the old one closes
+    new = TrackOCRDispatcher("ENTRY", pool, lambda track: None)
+    new.start()
+    old.close(timeout=1.0)
+    assert pool.callbacks["ENTRY"] == new.on_result
+    new.close(timeout=1.0)
+    assert "ENTRY" not in pool.callbacks
+
+
+class FakeSharedMemory:
+    def __init__(self):
+        self.closed = self.unlinked = False
+
+    def close(self):
+        self.closed = True
+
+    def unlink(self):
+        self.unlinked = True
+
+
+class FakeWorker:
+    name = "OCRWorker-0"
+    exitcode = -9
+
+    def __init__(self, alive):
+        self.alive = alive
+
+    def is_alive(self):
+        return self.alive
+
+
+def test_job_of_a_dead_worker_expires_and_its_track_commits():
+    PlateTrack = pytest.importorskip("src.core.plate_tracker").PlateTrack
+    pool = OCRProcessPool(num_workers=1, job_timeout=30.0)
+    pool.running = True
+    # Killed mid-job: its answer never comes
+    pool._workers = [FakeWorker(alive=False)]
+    replacement = FakeWorker(alive=True)
+    pool._spawn_worker = lambda index: replacement
+    committed = []
+    dispatcher = TrackOCRDispatcher("ENTRY", pool, committed.append)
+    dispatcher.start()
+
+    track = PlateTrack(1, (0, 0, 10, 10), time.time())
+    track.pending_ocr = 1
+    dispatcher.pending_tracks[track.track_id] = track
+    shm = FakeSharedMemory()
+    job = OCRJob(1, "ENTRY", time.time(), [track.track_id], shm)
+    job.submitted_at -= 60.0
+    pool._jobs[1] = job
+    dispatcher.finish(track)
+
+    pool._restart_dead_workers()
+    pool._expire_jobs()
+    dispatcher.close(timeout=1.0)
+
+    assert committed == [track]
+    assert shm.closed and shm.unlinked
+    assert pool._workers == [replacement]
+    stats = pool.get_stats()
+    assert (stats['workers_alive'], stats['restarted_workers']) == (1, 1)
+    assert (stats['pending_jobs'], stats['expired_jobs']) == (0, 1)
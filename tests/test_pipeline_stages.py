@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+from src.core.pipeline_stages import (BLOCK, DROP_NEWEST, DROP_OLDEST, BoundedQueue, Stage,
+                                      StageStats, make_queue)
+
+
+def test_make_queue_defaults():
+    frames = make_queue('frames')
+    assert (frames.maxsize, frames.policy) == (2, DROP_OLDEST)
+    tracks = make_queue('tracks')
+    assert (tracks.maxsize, tracks.policy) == (256, BLOCK)
+
+
+def test_make_queue_overrides():
+    queues = {'tracks': {'maxsize': 7, 'policy': DROP_NEWEST}, 'frames': {'maxsize': 4}}
+    tracks = make_queue('tracks', queues)
+    assert (tracks.maxsize, tracks.policy) == (7, DROP_NEWEST)
+    frames = make_queue('frames', queues)
+    assert (frames.maxsize, frames.policy) == (4, DROP_OLDEST)
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        BoundedQueue('frames', policy='drop_random')
+
+
+def test_drop_oldest_keeps_newest_items():
+    queue = BoundedQueue('frames', maxsize=2, policy=DROP_OLDEST)
+    for item in range(5):
+        assert queue.put(item)
+    assert [queue.get(timeout=0), queue.get(timeout=0)] == [3, 4]
+    stats = queue.get_stats()
+    assert stats['dropped'] == 3
+    assert stats['max_depth'] == 2
+
+
+def test_drop_newest_rejects_new_items():
+    queue = BoundedQueue('events', maxsize=2, policy=DROP_NEWEST)
+    assert queue.put(1) and queue.put(2)
+    assert not queue.put(3)
+    assert [queue.get(timeout=0), queue.get(timeout=0)] == [1, 2]
+    assert queue.get_stats()['dropped'] == 1
+
+
+def test_block_waits_for_room():
+    queue = BoundedQueue('events', maxsize=1, policy=BLOCK)
+    queue.put('a')
+    assert not queue.put('b', timeout=0.05)
+
+    threading.Timer(0.05, queue.get).start()
+    assert queue.put('c', timeout=2.0)
+    assert queue.get(timeout=0) == 'c'
+    stats = queue.get_stats()
+    assert stats['dropped'] == 0
+    assert stats['blocked_ms'] > 0
+
+
+def test_get_times_out_with_none():
+    assert BoundedQueue('events').get(timeout=0.01) is None
+
+
+def test_stage_drains_inbox_on_stop():
+    inbox = BoundedQueue('events', maxsize=16)
+    seen = []
+    stage = Stage('persist', inbox, seen.append)
+    stage.start()
+    for item in range(10):
+        inbox.put(item)
+    stage.stop()
+    assert seen == list(range(10))
+    assert stage.stats.get_stats()['processed'] == 10
+
+
+def test_stage_survives_errors():
+    inbox = BoundedQueue('events')
+    seen = []
+
+    def handle(item):
+        if item == 'bad':
+            raise RuntimeError(item)
+        seen.append(item)
+
+    stage = Stage('persist', inbox, handle)
+    stage.start()
+    for item in ('a', 'bad', 'b'):
+        inbox.put(item)
+    stage.stop()
+    assert seen == ['a', 'b']
+
+
+def test_stage_stats():
+    stats = StageStats('detect')
+    now = time.time()
+    stats.record(now - 0.02, now)
+    stats.record(now - 0.01, now)
+    result = stats.get_stats()
+    assert result['processed'] == 2
+    assert result['max_ms'] == pytest.approx(20, abs=1)
+    assert result['avg_ms'] == pytest.approx(15, abs=1)
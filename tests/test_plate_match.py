@@ -0,0 +1,68 @@
+import pytest
+
+from src.core.plate_match import PlateMatchIndex, canonical_plate
+
+
+@pytest.fixture
+def members():
+    index = PlateMatchIndex(max_distance=1)
+    index.rebuild(["L1234AB", "B1234SD", "D1034XY"])
+    return index
+
+
+def test_region_letters_are_not_folded(members):
+    # T, L, S, D, G, Z and Q are real region letters, not digits
+    assert members.best_match("T1234AB") is None
+    assert members.best_match("S1234AB") is None
+    assert canonical_plate("T1234AB") == "T1234AB"
+    assert canonical_plate("S1234AB") != canonical_plate("L1234AB")
+
+
+def test_one_real_character_off_is_a_different_plate(members):
+    # A guest must not become a member because one digit differs
+    assert members.best_match("B1235SD") is None
+    assert members.best_match("B1234SO") is None
+
+
+def test_folds_only_where_the_layout_decides():
+    assert canonical_plate("B1O34SD") == "B1034SD"
+    assert canonical_plate("81234SD") == "B1234SD"
+    assert canonical_plate("B12I4S8") == "B1214SB"
+    # Region letters followed by digits keep their letters
+    assert canonical_plate("AB123") == "AB123"
+    assert canonical_plate("B1234SD") == "B1234SD"
+
+
+def test_layout_confusables_match_exactly(members):
+    assert members.best_match("B1O34SD") is None
+    assert members.best_match("81234SD") == "B1234SD"
+    assert members.best_match("DIO34XY") == "D1034XY"
+    assert members.best_match("b 1234 sd") == "B1234SD"
+
+
+def test_confusable_swap_counts_as_one_edit():
+    index = PlateMatchIndex(max_distance=1)
+    # Plates outside the usual layout are only matched by swapping
+    index.rebuild(["RI1O"])
+    assert index.best_match("RI10") == "RI1O"
+    assert index.best_match("R110") is None
+
+    strict = PlateMatchIndex(max_distance=0)
+    strict.rebuild(["RI1O"])
+    assert strict.best_match("RI10") is None
+
+
+def test_ambiguous_reads_are_refused():
+    index = PlateMatchIndex(max_distance=1)
+    # Both are one swap away from the read
+    index.rebuild(["Q0OX", "QO0X"])
+    assert index.best_match("Q00X") is None
+
+
+def test_add_and_remove():
+    index = PlateMatchIndex()
+    index.add("B1234SD")
+    assert index.best_match("81234SD") == "B1234SD"
+    index.remove("B1234SD")
+    assert index.best_match("81234SD") is None
+    assert len(index) == 0
@@ -0,0 +1,57 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+from src.core.motion_gate import MotionGate
+from src.core.plate_tracker import PlateTracker
+
+PLATE_BOX = (100, 120, 220, 160)
+
+
+def lane_frame(car_present):
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    if car_present:
+        x1, y1, x2, y2 = PLATE_BOX
+        frame[y1 - 60:y2 + 40, x1 - 40:x2 + 40] = 90
+        # Plate characters give the crop some sharpness
+        frame[y1:y2, x1:x2] = 255
+        frame[y1 + 10:y2 - 10, x1 + 10:x2 - 10:12] = 0
+    return frame
+
+
+def run_lane(car_timeline, fps=10):
+    """Drive the gate and tracker the way LanePipeline.detect_frame does"""
+    gate = MotionGate()
+    tracker = PlateTracker()
+    finished = []
+    detected_frames = 0
+    now = 1000.0
+    for car_present, seconds in car_timeline:
+        for _ in range(int(seconds * fps)):
+            now += 1.0 / fps
+            frame = lane_frame(car_present)
+            if gate.should_detect(frame, now):
+                detected_frames += 1
+                boxes = [PLATE_BOX] if car_present else []
+                finished.extend(tracker.update(boxes, frame, now)[1])
+            else:
+                tracker.hold(now)
+    return finished, detected_frames, tracker
+
+
+def test_car_waiting_at_the_barrier_is_committed_once():
+    # Empty lane, a car stops for a minute (far past the gate hold), then drives off
+    finished, detected_frames, tracker = run_lane([(False, 1), (True, 60), (False, 5)])
+    assert len(finished) == 1
+    assert not tracker.tracks
+    # The gate really closed while the car stood still
+    assert detected_frames < 10 * 20
+    # Committed only after the car left, not while it was waiting
+    assert finished[0].last_seen > 1000.0 + 60
+
+
+def test_held_track_is_not_committed_while_the_car_stands_still():
+    finished, _, tracker = run_lane([(False, 1), (True, 60)])
+    assert finished == []
+    assert len(tracker.tracks) == 1
@@ -0,0 +1,83 @@
+import os
+import time
+
+from src.core.lane_registry import LaneConfig
+from src.core.retention import IMAGE_ROOT, LOG_ROOT, LANE_BUDGET, RetentionManager, budgets_for_lanes
+
+
+def write(path, size, age=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_every_lane_gets_its_own_budget():
+    lanes = [LaneConfig("entry", 0), LaneConfig("entry_2", 2, role="entry"),
+             LaneConfig("exit", 1, role="exit", retention={'max_bytes': 1000})]
+    budgets = budgets_for_lanes(lanes)
+    assert budgets[lanes[0].image_dir] == LANE_BUDGET
+    # Nested under Entry/, yet limited on its own
+    assert lanes[1].image_dir.startswith(lanes[0].image_dir + os.sep)
+    assert lanes[1].image_dir in budgets
+    assert budgets[lanes[2].image_dir]['max_bytes'] == 1000
+    assert IMAGE_ROOT in budgets and LOG_ROOT in budgets
+
+
+def test_nested_lane_files_count_only_against_their_lane(tmp_path):
+    entry = str(tmp_path / "Entry")
+    entry_2 = os.path.join(entry, "entry_2")
+    write(os.path.join(entry, "a.jpg"), 100)
+    write(os.path.join(entry_2, "b.jpg"), 300)
+    manager = RetentionManager({entry: {'max_age_days': 90, 'max_bytes': 1000},
+                                entry_2: {'max_age_days': 90, 'max_bytes': 1000}})
+    manager.scan()
+    stats = manager.get_stats()
+    assert stats[entry]['bytes'] == 100
+    assert stats[entry_2]['bytes'] == 300
+
+
+def test_tracking_an_already_indexed_file_only_updates_its_size(tmp_path):
+    events = str(tmp_path / "events")
+    path = os.path.join(events, "events_2026-01-01_001.jsonl")
+    # Open during the scan, then closed with more bytes and reported by the event log
+    write(path, 100)
+    manager = RetentionManager({events: {'max_age_days': 365, 'max_bytes': 10_000}})
+    manager.scan()
+    manager.track(path, 400)
+    stats = manager.get_stats()[events]
+    assert stats['files'] == 1
+    assert stats['bytes'] == 400
+
+
+def test_evicts_oldest_first_when_over_size(tmp_path):
+    root = str(tmp_path / "Exit")
+    write(os.path.join(root, "old.jpg"), 600, age=100)
+    write(os.path.join(root, "new.jpg"), 600)
+    manager = RetentionManager({root: {'max_age_days': 90, 'max_bytes': 1000}})
+    manager.scan()
+    assert manager.run_once() == 1
+    assert not os.path.exists(os.path.join(root, "old.jpg"))
+    assert os.path.exists(os.path.join(root, "new.jpg"))
+    assert manager.get_stats()[root]['bytes'] == 600
+
+
+def test_evicts_by_age(tmp_path):
+    root = str(tmp_path / "Entry")
+    write(os.path.join(root, "2020-01-01", "old.jpg"), 10, age=100 * 86400)
+    manager = RetentionManager({root: {'max_age_days': 90, 'max_bytes': 1000}})
+    manager.scan()
+    assert manager.run_once() == 1
+    # The emptied day shard goes too
+    assert not os.path.exists(os.path.join(root, "2020-01-01"))
+
+
+def test_files_before_the_scan_are_left_to_it(tmp_path):
+    root = str(tmp_path / "Entry")
+    manager = RetentionManager({root: {'max_age_days': 90, 'max_bytes': 1000}})
+    path = os.path.join(root, "a.jpg")
+    write(path, 10)
+    manager.track(path, 10)
+    manager.scan()
+    assert manager.get_stats()[root]['bytes'] == 10